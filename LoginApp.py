@@ -1,33 +1,67 @@
+import importlib
+import threading
+import time
+from types import SimpleNamespace
+
+STARTED = time.perf_counter()  # Taken before Kivy loads, for the startup profile
+
 from kivy.app import App
+from kivy.uix.screenmanager import Screen, ScreenManager, NoTransition
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.spinner import Spinner
 from kivy.uix.button import Button
 from kivy.core.window import Window
-from kivy.uix.image import Image
+from kivy.uix.image import AsyncImage
+from kivy.cache import Cache
+from kivy.clock import Clock
+from kivy.logger import Logger
 from kivy.metrics import dp
 
-Window.size = (600, 700)  # Reduced window height
+IMPORTED = time.perf_counter()
+HEADER_IMAGE = 'Business Salesman.gif'
+LOGIN_WINDOW_SIZE = (600, 700)  # Reduced window height
+DASHBOARD_WINDOW_SIZE = (1200, 800)
+
+# Dashboard per role, as (module, class). Roles without one can log in but
+# have no screen to go to yet.
+DASHBOARDS = {'Admin': ('admin_dashboard', 'AdminDashboard')}
+
+Window.size = LOGIN_WINDOW_SIZE
+
+# The loader decodes images on its worker threads and caches the result for
+# 60 s by default; keep the header for the whole session so coming back to
+# the login screen never decodes the GIF again
+Cache.register('kv.loader', limit=500, timeout=None)
 
 
 class LoginScreen(BoxLayout):
+    # on_login(user) fires once the credentials have been verified
+    __events__ = ('on_login',)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.authenticator = None  # Taken from the app on the first attempt, off the start-up path
+        self._checking = False
+        self.setting_up = False  # True while the first administrator account is being made
         self.orientation = 'vertical'
         self.padding = dp(20)  # Reduced padding
         self.spacing = dp(10)  # Reduced spacing
 
-        # School logo/header - smaller size
-        self.add_widget(Image(source='Business Salesman.gif',
-                              size_hint=(1, 0.2),
-                              allow_stretch=True))
+        # School logo/header - smaller size. Decoded off the UI thread, so the
+        # form is usable before the animation has loaded
+        self.header = AsyncImage(source=HEADER_IMAGE,
+                                 size_hint=(1, 0.2),
+                                 allow_stretch=True)
+        self.add_widget(self.header)
 
         # Title - smaller font
-        self.add_widget(Label(text="Login System",
-                              font_size=dp(20),
-                              bold=True,
-                              size_hint=(1, 0.08)))
+        self.title_label = Label(text="Login System",
+                                 font_size=dp(20),
+                                 bold=True,
+                                 size_hint=(1, 0.08))
+        self.add_widget(self.title_label)
 
         # Username input
         self.username = TextInput(
@@ -36,6 +70,7 @@ class LoginScreen(BoxLayout):
             height=dp(40),
             multiline=False
         )
+        self.username.bind(on_text_validate=lambda x: setattr(self.password, 'focus', True))
         self.add_widget(self.username)
 
         # Password input
@@ -46,8 +81,19 @@ class LoginScreen(BoxLayout):
             multiline=False,
             password=True  # Hide password characters
         )
+        self.password.bind(on_text_validate=self.login)
         self.add_widget(self.password)
 
+        # Password confirmation, only shown while setting up the first account
+        self.confirm_password = TextInput(
+            hint_text='Confirm Password',
+            size_hint=(1, None),
+            height=dp(40),
+            multiline=False,
+            password=True
+        )
+        self.confirm_password.bind(on_text_validate=self.login)
+
         # Role selection spinner - smaller height
         self.role_spinner = Spinner(
             text='Select Role',
@@ -67,8 +113,16 @@ class LoginScreen(BoxLayout):
             background_normal='',
             color=(1, 1, 1, 1)
         )
+        self.login_btn.bind(on_press=self.login)
         self.add_widget(self.login_btn)
 
+        # Login result - red for errors, green on success
+        self.message = Label(text='',
+                             font_size=dp(12),
+                             size_hint=(1, None),
+                             height=dp(25))
+        self.add_widget(self.message)
+
         # Forgot password button (green) - smaller height
         self.forgot_btn = Button(
             text="Forgot Password?",
@@ -86,10 +140,267 @@ class LoginScreen(BoxLayout):
                               font_size=dp(10),
                               size_hint=(1, 0.05)))
 
+    def start_setup(self):
+        # No accounts exist yet: the form makes the administrator account
+        # instead of checking a login
+        self.setting_up = True
+        self.title_label.text = "Create Administrator Account"
+        self.password.hint_text = 'New Password'
+        self.password.bind(on_text_validate=self._focus_confirm)
+        self.password.unbind(on_text_validate=self.login)
+        self.add_widget(self.confirm_password, index=self.children.index(self.password))
+        self.role_spinner.text = 'Admin'
+        self.role_spinner.disabled = True
+        self.login_btn.text = "Create Account"
+        self.show_message("No accounts yet: choose the administrator's username and password", error=False)
+
+    def _finish_setup(self):
+        self.setting_up = False
+        self.title_label.text = "Login System"
+        self.password.hint_text = 'Password'
+        self.password.unbind(on_text_validate=self._focus_confirm)
+        self.password.bind(on_text_validate=self.login)
+        self.remove_widget(self.confirm_password)
+        self.role_spinner.disabled = False
+        self.login_btn.text = "Login"
+
+    def _focus_confirm(self, instance):
+        self.confirm_password.focus = True
+
+    def login(self, instance):
+        if self._checking:
+            return
+        if self.setting_up:
+            self._create_admin()
+            return
+        username = self.username.text.strip()
+        password = self.password.text
+        role = self.role_spinner.text
+        if not username or not password:
+            self.show_message("Enter your username and password", error=True)
+            return
+        if role not in self.role_spinner.values:
+            self.show_message("Select your role", error=True)
+            return
+
+        if self.authenticator is None:
+            self.authenticator = App.get_running_app().get_authenticator()
+
+        # The hash check is slow on purpose; it runs on a worker and the
+        # result comes back to the UI thread on the next frame
+        self._checking = True
+        self.login_btn.disabled = True
+        self.login_btn.text = "Checking..."
+        future = self.authenticator.authenticate(username, password, role)
+        future.add_done_callback(lambda done: Clock.schedule_once(lambda dt: self._login_finished(done)))
+
+    def _create_admin(self):
+        username = self.username.text.strip()
+        password = self.password.text
+        if not username or not password:
+            self.show_message("Enter a username and password", error=True)
+            return
+        if password != self.confirm_password.text:
+            self.show_message("The passwords do not match", error=True)
+            self.confirm_password.text = ''
+            self.confirm_password.focus = True
+            return
+
+        if self.authenticator is None:
+            self.authenticator = App.get_running_app().get_authenticator()
+
+        # Hashing the new password is as slow as checking one
+        self._checking = True
+        self.login_btn.disabled = True
+        self.login_btn.text = "Creating..."
+        future = self.authenticator.create_admin(username, password)
+        future.add_done_callback(lambda done: Clock.schedule_once(lambda dt: self._login_finished(done)))
+
+    def _login_finished(self, future):
+        self._checking = False
+        self.login_btn.disabled = False
+        self.login_btn.text = "Create Account" if self.setting_up else "Login"
+        self.password.text = ''
+        self.confirm_password.text = ''
+        try:
+            user, message = future.result()
+        except Exception as e:
+            user, message = None, f"Login failed: {str(e)}"
+
+        if user is None:
+            self.show_message(message, error=True)
+            self.password.focus = True
+            return
+        if self.setting_up:
+            self._finish_setup()
+        self.show_message(message, error=False)
+        self.dispatch('on_login', user)
+
+    def show_message(self, text, error):
+        self.message.text = text
+        self.message.color = (1, 0.4, 0.4, 1) if error else (0.2, 0.7, 0.3, 1)
+
+    def on_login(self, user):
+        pass
+
+    def reset(self):
+        # Ready for the next person at a shared terminal
+        self.username.text = ''
+        self.password.text = ''
+        self.message.text = ''
+        self.username.focus = True
+
 
 class LoginApp(App):
+    # One app for every role: the login screen, then the role's dashboard in
+    # the same ScreenManager (AdminDashboard.logout switches back to 'login')
     def build(self):
-        return LoginScreen()
+        # Startup profile: (phase, seconds since the process started),
+        # also written to the Kivy log
+        self.startup_profile = []
+        self._log_phase('imports', IMPORTED)
+
+        self._database = None
+        self._database_lock = threading.Lock()
+        self._authenticator = None
+        self._dashboards = {}  # role -> its dashboard screen, None while it loads
+        self._pending_user = None  # Logged in before their dashboard was ready
+        self._signed_in = None  # Username whose dashboard is showing
+
+        self.login_screen = LoginScreen()
+        self.login_screen.header.bind(on_load=lambda image: self._log_phase('header image'))
+        self.login_screen.bind(on_login=lambda screen, user: self.route(user))
+        # Picking a role starts loading its dashboard while the password is typed
+        self.login_screen.role_spinner.bind(text=lambda spinner, role: self.preload(role))
+
+        self.manager = ScreenManager(transition=NoTransition())
+        login = Screen(name='login')
+        login.add_widget(self.login_screen)
+        login.bind(on_enter=self._back_to_login)
+        self.manager.add_widget(login)
+        self._log_phase('build')
+        return self.manager
+
+    def on_start(self):
+        Clock.schedule_once(self._first_frame)
+
+    def on_stop(self):
+        # Lets the dashboards' log writers finish the events still queued
+        for dashboard in self._dashboards.values():
+            if dashboard is not None:
+                dashboard.event_log.close()
+
+    def _first_frame(self, dt):
+        # The window is up: put the cursor in the username box
+        self.login_screen.username.focus = True
+        self._log_phase('first frame')
+        threading.Thread(target=self._check_accounts, name='accounts', daemon=True).start()
+
+    def _check_accounts(self):
+        # A new install has no accounts; its login screen then sets up the
+        # administrator instead of offering a password nobody chose
+        try:
+            needs_setup = not self.open_database().has_users()
+        except Exception as e:
+            error = str(e)
+            Clock.schedule_once(lambda dt: self.login_screen.show_message(f"Could not open the database: {error}",
+                                                                          error=True))
+            return
+        if needs_setup:
+            Clock.schedule_once(lambda dt: self.login_screen.start_setup())
+
+    def _log_phase(self, phase, reached=None):
+        seconds = (reached or time.perf_counter()) - STARTED
+        self.startup_profile.append((phase, seconds))
+        Logger.info(f"Startup: {phase} at {seconds * 1000:.0f} ms")
+
+    def open_database(self):
+        # Shared by the login check and the dashboards; opened on first use
+        # by whichever thread needs it first
+        with self._database_lock:
+            if self._database is None:
+                from school_db import SchoolDatabase
+                self._database = SchoolDatabase()
+            return self._database
+
+    def get_authenticator(self):
+        if self._authenticator is None:
+            from auth import Authenticator
+            self._authenticator = Authenticator(self.open_database())
+        return self._authenticator
+
+    def preload(self, role):
+        if role not in DASHBOARDS or role in self._dashboards:
+            return
+        self._dashboards[role] = None
+        started = time.perf_counter()
+        # The module is imported here: importing Kivy widget modules creates
+        # graphics instructions, which only the UI thread may do
+        module_name, class_name = DASHBOARDS[role]
+        try:
+            dashboard_class = getattr(importlib.import_module(module_name), class_name)
+        except Exception as e:
+            self._preload_failed(role, str(e))
+            return
+        threading.Thread(target=self._preload_worker, args=(role, dashboard_class, started),
+                         name='preload', daemon=True).start()
+
+    def _preload_worker(self, role, dashboard_class, started):
+        # The database read and search index happen here, off the UI thread;
+        # only the widgets are left for the UI thread to make
+        try:
+            database = self.open_database()
+            snapshot = dashboard_class.load_snapshot(database)
+        except Exception as e:
+            error = str(e)
+            Clock.schedule_once(lambda dt: self._preload_failed(role, error))
+        else:
+            Clock.schedule_once(lambda dt: self._preloaded(role, dashboard_class(database=database,
+                                                                                 snapshot=snapshot), started))
+
+    def _preloaded(self, role, dashboard, started):
+        # Added off screen; the dashboard builds itself on the next frame
+        self.manager.add_widget(dashboard)
+        self._dashboards[role] = dashboard
+        Logger.info(f"Login: {role} dashboard preloaded in {(time.perf_counter() - started) * 1000:.0f} ms")
+        if self._pending_user is not None and self._pending_user.role == role:
+            self._show_dashboard(dashboard, self._pending_user)
+
+    def _preload_failed(self, role, error):
+        self._dashboards.pop(role, None)
+        Logger.warning(f"Login: could not load the {role} dashboard: {error}")
+        if self._pending_user is not None and self._pending_user.role == role:
+            self._pending_user = None
+            self.login_screen.show_message(f"Could not open the {role} dashboard: {error}", error=True)
+
+    def route(self, user):
+        # The dashboards read the user's attributes (full_name, role, ...)
+        user = SimpleNamespace(**user)
+        if user.role not in DASHBOARDS:
+            self.login_screen.show_message(f"No dashboard is available for the {user.role} role yet", error=True)
+            return
+        dashboard = self._dashboards.get(user.role)
+        if dashboard is None:
+            # Logged in before the preload finished; it switches over when ready
+            self._pending_user = user
+            self.preload(user.role)
+            return
+        self._show_dashboard(dashboard, user)
+
+    def _show_dashboard(self, dashboard, user):
+        self._pending_user = None
+        self._signed_in = user.username
+        dashboard.current_user = user
+        Window.size = DASHBOARD_WINDOW_SIZE
+        self.manager.current = dashboard.name
+
+    def _back_to_login(self, screen):
+        # Logged out: the next login checks the password in full
+        if self._signed_in is not None:
+            self.get_authenticator().forget(self._signed_in)
+            self._signed_in = None
+        Window.size = LOGIN_WINDOW_SIZE
+        self.login_screen.reset()
 
 
 if __name__ == '__main__':
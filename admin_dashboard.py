@@ -7,59 +7,1210 @@ from kivy.uix.tabbedpanel import TabbedPanel, TabbedPanelItem
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleview.layout import RecycleLayoutManagerBehavior
+from kivy.uix.recycleview.datamodel import RecycleDataModelBehavior
+from kivy.event import EventDispatcher
+from kivy.uix.layout import Layout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.uix.spinner import Spinner
 from kivy.uix.popup import Popup
-from kivy.uix.filechooser import FileChooserListView
+from kivy.uix.progressbar import ProgressBar
 from kivy.metrics import dp
-from kivy.properties import ObjectProperty, StringProperty, ListProperty
+from kivy.properties import ObjectProperty, StringProperty, ListProperty, NumericProperty
 from kivy.core.window import Window
 from kivy.clock import Clock
-from datetime import datetime
-import csv
+from datetime import datetime, date
+from array import array
+from itertools import compress
+from functools import reduce
+import operator
+import sqlite3
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import queue
+import time
 from kivy.logger import Logger
 
-# Add this at the beginning of your app
-Logger.setLevel('ERROR')  # Only show errors and above
+from student_import import ImportJob, ParallelImportJob, SHARD_BYTES
+from school_db import SchoolDatabase
+from fee_reports import summarise_fees, AGING_BUCKETS, load_numpy
+from timings import Timings
+from event_log import EventLog, matches as event_matches
+from record_export import ExportJob
 
-Window.size = (1200, 800)
+
+class NumberColumn:
+    # One typed array per numeric field instead of a boxed value per record
+    def __init__(self, typecode, default=0):
+        self.values = array(typecode)
+        self.default = default
+
+    def append(self, value):
+        self.values.append(value)
+
+    def extend(self, values):
+        self.values.extend(values)
+
+    def get(self, position):
+        return self.values[position]
+
+    def set(self, position, value):
+        self.values[position] = value
+
+    @property
+    def nbytes(self):
+        return self.values.itemsize * len(self.values)
+
+
+class FlagColumn(NumberColumn):
+    def __init__(self, default=True):
+        super().__init__('b', default)
+
+    def append(self, value):
+        self.values.append(bool(value))
+
+    def extend(self, values):
+        self.values.extend(map(bool, values))
+
+    def get(self, position):
+        return bool(self.values[position])
+
+    def set(self, position, value):
+        self.values[position] = bool(value)
+
+
+class CategoryColumn:
+    # Dictionary-encoded text for fields with few distinct values (class,
+    # role): each row stores a code into `labels`
+    def __init__(self, default=''):
+        self.codes = array('I')
+        self.labels = []
+        self._lookup = {}
+        self.default = default
+
+    def code(self, label):
+        code = self._lookup.get(label)
+        if code is None:
+            code = self._lookup[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.code(value))
+
+    def extend(self, values):
+        self.codes.extend(map(self.code, values))
+
+    def get(self, position):
+        return self.labels[self.codes[position]]
+
+    def set(self, position, value):
+        self.codes[position] = self.code(value)
+
+    @property
+    def nbytes(self):
+        return self.codes.itemsize * len(self.codes)
+
+
+class TextColumn:
+    # Free text packed as UTF-8 into one buffer; a row is a (start, length)
+    # slice of it. Edits append the new text and leave the old bytes behind,
+    # which is fine for fields that rarely change.
+    def __init__(self, default=''):
+        self.buffer = bytearray()
+        self.starts = array('I')  # Offsets into a buffer of up to 4 GiB
+        self.lengths = array('I')
+        self.default = default
+
+    def append(self, value):
+        data = value.encode('utf-8')
+        self.starts.append(len(self.buffer))
+        self.lengths.append(len(data))
+        self.buffer += data
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def get(self, position):
+        start = self.starts[position]
+        return self.buffer[start:start + self.lengths[position]].decode('utf-8')
+
+    def set(self, position, value):
+        data = value.encode('utf-8')
+        self.starts[position] = len(self.buffer)
+        self.lengths[position] = len(data)
+        self.buffer += data
+
+    @property
+    def nbytes(self):
+        return len(self.buffer) + self.starts.itemsize * len(self.starts) + self.lengths.itemsize * len(self.lengths)
+
+
+class HashIndex:
+    # Open-addressing hash table from one column's values to row positions.
+    # Slots hold positions only and keys are read back from the column, so
+    # an index costs 8-16 bytes per row rather than a dict entry plus a key
+    # object. When a value repeats, the latest row wins.
+    EMPTY = -1
+    REMOVED = -2
+
+    def __init__(self, column):
+        self.column = column
+        self.slots = array('i', [self.EMPTY]) * 8
+        self.used = 0  # Slots that are filled or REMOVED
+
+    def _first_slot(self, key, size):
+        # Fibonacci hashing: Python hashes consecutive ids to consecutive
+        # numbers, which would pile up into one long probe run
+        return ((hash(key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (65 - size.bit_length())
+
+    def get(self, key):
+        slots, column = self.slots, self.column
+        mask = len(slots) - 1
+        slot = self._first_slot(key, len(slots))
+        while True:
+            position = slots[slot]
+            if position == self.EMPTY:
+                return None
+            if position >= 0 and column.get(position) == key:
+                return position
+            slot = (slot + 1) & mask
+
+    def add(self, key, position):
+        if (self.used + 1) * 2 > len(self.slots):
+            self._resize()
+        slots, column = self.slots, self.column
+        mask = len(slots) - 1
+        slot = self._first_slot(key, len(slots))
+        reuse = None
+        while True:
+            current = slots[slot]
+            if current == self.EMPTY:
+                break
+            if current == self.REMOVED:
+                if reuse is None:
+                    reuse = slot
+            elif column.get(current) == key:
+                slots[slot] = position
+                return
+            slot = (slot + 1) & mask
+        if reuse is None:
+            self.used += 1
+            reuse = slot
+        slots[reuse] = position
+
+    def discard(self, key, position):
+        slots = self.slots
+        mask = len(slots) - 1
+        slot = self._first_slot(key, len(slots))
+        while slots[slot] != self.EMPTY:
+            if slots[slot] == position:
+                slots[slot] = self.REMOVED
+                return
+            slot = (slot + 1) & mask
+
+    def _resize(self):
+        # Rehash the live positions into a table at most a quarter full
+        positions = [position for position in self.slots if position >= 0]
+        size = 8
+        while size < 4 * (len(positions) + 1):
+            size *= 2
+        self.slots = slots = array('i', [self.EMPTY]) * size
+        self.used = len(positions)
+        mask = size - 1
+        for position in positions:
+            slot = self._first_slot(self.column.get(position), size)
+            while slots[slot] != self.EMPTY:
+                slot = (slot + 1) & mask
+            slots[slot] = position
+
+    @property
+    def nbytes(self):
+        return self.slots.itemsize * len(self.slots)
+
+
+def bisect_left(positions, target, key):
+    # First index of `positions`, ordered by key(position), whose key is >= target
+    low, high = 0, len(positions)
+    while low < high:
+        middle = (low + high) // 2
+        if key(positions[middle]) < target:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def bisect_right(positions, target, key):
+    # First index whose key is > target
+    low, high = 0, len(positions)
+    while low < high:
+        middle = (low + high) // 2
+        if target < key(positions[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+class SortedIndex:
+    # Live row positions kept in order of one column. Ties are broken by
+    # position, so every row has a distinct key (value, position) and a page
+    # can be found again from the key of its first row. A single add or
+    # discard costs a binary search plus one array shift; bulk loads just
+    # drop the order, and it is sorted again once, by whoever reads it next.
+    def __init__(self, store, name, transform=None):
+        self.store = store
+        self.column = store.columns[name]
+        self.transform = transform  # e.g. str.casefold, so 'amina' sorts with 'Amina'
+        self._positions = None
+        self.version = 0  # Bumped on every change, for callers caching derived orders
+
+    def key(self, position):
+        value = self.column.get(position)
+        return (value if self.transform is None else self.transform(value)), position
+
+    @property
+    def positions(self):
+        if self._positions is None:
+            self._positions = array('q', sorted(self.store.rows().positions, key=self.key))
+        return self._positions
+
+    def invalidate(self):
+        self._positions = None
+        self.version += 1
+
+    def add(self, position):
+        if self._positions is not None:
+            self._positions.insert(bisect_left(self._positions, self.key(position), self.key), position)
+        self.version += 1
+
+    def discard(self, position):
+        # Must run while the row still holds the value it was sorted by
+        positions = self._positions
+        if positions is not None:
+            index = bisect_left(positions, self.key(position), self.key)
+            if index < len(positions) and positions[index] == position:
+                del positions[index]
+        self.version += 1
+
+    @property
+    def nbytes(self):
+        return 0 if self._positions is None else self._positions.itemsize * len(self._positions)
+
+
+# bin() digits to bytes 0/1 and back, to convert between bitmaps and
+# one-byte-per-row flags in C
+_BINARY_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+_FLAG_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def bitmap_of(positions):
+    # Bitmap (an int with bit i set for row i) of the given positions
+    positions = list(positions)
+    if not positions:
+        return 0
+    flags = bytearray(max(positions) + 1)
+    for position in positions:
+        flags[position] = 1
+    return int(flags.translate(_FLAG_DIGITS)[::-1], 2)
+
+
+def bitmap_flags(bitmap, size):
+    # One byte per row, 1 where the bitmap has the row's bit set
+    return bin(bitmap)[:1:-1].encode('ascii').translate(_BINARY_DIGITS).ljust(size, b'\x00')
+
+
+def bitmap_positions(bitmap):
+    # The set bits of a bitmap as ascending positions; the loop runs in C
+    flags = bitmap_flags(bitmap, bitmap.bit_length())
+    return array('q', compress(range(len(flags)), flags))
+
+
+def restrict(ordered, flags):
+    # The positions of `ordered` whose flag is set, keeping their order.
+    # One pass in C, so a maintained order can be narrowed to a search
+    # result instead of sorting the result again.
+    numpy = load_numpy()
+    if numpy is not None and isinstance(ordered, array):
+        positions = numpy.frombuffer(ordered, dtype=numpy.int64)
+        return array('q', positions[numpy.frombuffer(flags, dtype=numpy.bool_)[positions]].tobytes())
+    return array('q', compress(ordered, map(flags.__getitem__, ordered)))
+
+
+class BitmapIndex:
+    # One bitmap per distinct value of a column (or of key(value)), held as
+    # an int whose bit i is set when row i has that value. Filters combine
+    # them with & and |, which run a machine word at a time in C, and an
+    # edit only moves one bit between two bitmaps. Removed rows have no bit
+    # set anywhere.
+    def __init__(self, store, name, key=None):
+        self.column = store.columns[name]
+        self.key = key
+        groups = {}
+        for position in store.rows().positions:
+            groups.setdefault(self.value(position), []).append(position)
+        self.bitmaps = {value: bitmap_of(positions) for value, positions in groups.items()}
+
+    def value(self, position):
+        value = self.column.get(position)
+        return value if self.key is None else self.key(value)
+
+    def add(self, position):
+        value = self.value(position)
+        self.bitmaps[value] = self.bitmaps.get(value, 0) | 1 << position
+
+    def discard(self, position):
+        # Must run while the row still holds the value it is indexed under
+        value = self.value(position)
+        self.bitmaps[value] = self.bitmaps.get(value, 0) & ~(1 << position)
+
+    def extend(self, first, values):
+        # Rows first, first + 1, ... were appended with these column values
+        groups = {}
+        for offset, value in enumerate(values):
+            groups.setdefault(value if self.key is None else self.key(value), []).append(offset)
+        for value, offsets in groups.items():
+            self.bitmaps[value] = self.bitmaps.get(value, 0) | bitmap_of(offsets) << first
+
+    def get(self, *values):
+        # Rows holding any of the values
+        return reduce(operator.or_, (self.bitmaps.get(value, 0) for value in values), 0)
+
+    @property
+    def nbytes(self):
+        return sum((bitmap.bit_length() + 7) // 8 for bitmap in self.bitmaps.values())
+
+
+class RecordView:
+    # Dict-like handle on one row of a RecordStore. It holds no field data,
+    # so reads and writes always go to the columns.
+    __slots__ = ('store', 'position')
+
+    def __init__(self, store, position):
+        self.store = store
+        self.position = position
+
+    def __getitem__(self, name):
+        return self.store.columns[name].get(self.position)
+
+    def __setitem__(self, name, value):
+        self.store.set(self.position, name, value)
+
+    def get(self, name, default=None):
+        column = self.store.columns.get(name)
+        return default if column is None else column.get(self.position)
+
+
+class RecordSelection:
+    # A sequence of rows of a store, e.g. search results, as positions only
+    def __init__(self, store, positions):
+        self.store = store
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        return RecordView(self.store, self.positions[index])
+
+    def __iter__(self):
+        store = self.store
+        return (RecordView(store, position) for position in self.positions)
+
+
+class RecordStore:
+    # Column-oriented table. Rows are addressed by position, which never
+    # changes: removing a row only marks it deleted, so views stay valid.
+    # Columns named in `keys` get a HashIndex for lookups by value; any
+    # column gets a SortedIndex the first time something sorts by it, and a
+    # BitmapIndex the first time something filters on it.
+    def __init__(self, keys=(), **columns):
+        self.columns = columns
+        self.indexes = {name: HashIndex(columns[name]) for name in keys}
+        self.sorted_indexes = {}
+        self.bitmap_indexes = {}
+        self._live = array('b')
+        self._removed = 0
+
+    def __len__(self):
+        # Every position ever used, including removed rows
+        return len(self._live)
+
+    def __getitem__(self, position):
+        return RecordView(self, position)
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def append(self, record):
+        # Copies a record dict into the columns and returns its position
+        for name, column in self.columns.items():
+            column.append(record.get(name, column.default))
+        self._live.append(1)
+        position = len(self._live) - 1
+        for name, index in self.indexes.items():
+            index.add(record.get(name, self.columns[name].default), position)
+        for index in self.sorted_indexes.values():
+            index.add(position)
+        for index in self.bitmap_indexes.values():
+            index.add(position)
+        return position
+
+    def extend(self, records):
+        # Column by column, so each typed array grows in one call
+        records = list(records)
+        first = len(self._live)
+        for name, column in self.columns.items():
+            default = column.default
+            values = [record.get(name, default) for record in records]
+            column.extend(values)
+            index = self.indexes.get(name)
+            if index is not None:
+                for position, value in enumerate(values, first):
+                    index.add(value, position)
+            bitmap_index = self.bitmap_indexes.get(name)
+            if bitmap_index is not None:
+                bitmap_index.extend(first, values)
+        self._live.extend(b'\x01' * len(records))
+        if records:
+            # One sort on next use beats an insert per imported row
+            for index in self.sorted_indexes.values():
+                index.invalidate()
+
+    def set(self, position, name, value):
+        column = self.columns[name]
+        index = self.indexes.get(name)
+        if index is not None and self._live[position]:
+            index.discard(column.get(position), position)
+            index.add(value, position)
+        # Sorted and bitmap indexes read the row's current value, so the row
+        # leaves them before the change and rejoins after it
+        derived = [other for other in (self.sorted_indexes.get(name), self.bitmap_indexes.get(name))
+                   if other is not None and self._live[position]]
+        for derived_index in derived:
+            derived_index.discard(position)
+        column.set(position, value)
+        for derived_index in derived:
+            derived_index.add(position)
+
+    def find(self, name, value):
+        # O(1) lookup of a live row by an indexed column; None if absent
+        position = self.indexes[name].get(value)
+        return None if position is None else RecordView(self, position)
+
+    def remove(self, position):
+        if self._live[position]:
+            self._live[position] = 0
+            self._removed += 1
+            for name, index in self.indexes.items():
+                index.discard(self.columns[name].get(position), position)
+            for index in self.sorted_indexes.values():
+                index.discard(position)
+            for index in self.bitmap_indexes.values():
+                index.discard(position)
+
+    def bitmap_by(self, name, key=None):
+        # The BitmapIndex on a column, made on first use. key maps column
+        # values to the values bitmaps are kept for, e.g. a balance to a
+        # fee status; it must be the same on every call.
+        index = self.bitmap_indexes.get(name)
+        if index is None:
+            index = self.bitmap_indexes[name] = BitmapIndex(self, name, key)
+        return index
+
+    def sorted_by(self, name, transform=None):
+        # The SortedIndex on a column, made on first use
+        index = self.sorted_indexes.get(name)
+        if index is None:
+            index = self.sorted_indexes[name] = SortedIndex(self, name, transform)
+        return index
+
+    def rows(self):
+        # The live rows; without removals that is just a range
+        if not self._removed:
+            return RecordSelection(self, range(len(self._live)))
+        return self.select(position for position, live in enumerate(self._live) if live)
+
+    def select(self, positions):
+        return RecordSelection(self, array('q', positions))
+
+    @property
+    def live(self):
+        # 1 per position still in use, 0 for removed rows
+        return self._live
+
+    @property
+    def live_count(self):
+        return len(self._live) - self._removed
+
+    @property
+    def nbytes(self):
+        return (len(self._live) + sum(column.nbytes for column in self.columns.values())
+                + sum(index.nbytes for index in self.indexes.values())
+                + sum(index.nbytes for index in self.sorted_indexes.values())
+                + sum(index.nbytes for index in self.bitmap_indexes.values()))
+
+
+def new_student_store():
+    return RecordStore(keys=('id', 'student_number'),
+                       id=NumberColumn('q'),
+                       student_number=TextColumn(),
+                       name=TextColumn(),
+                       **{'class': CategoryColumn()},
+                       fees_paid=NumberColumn('d'),
+                       fees_due=NumberColumn('d'),
+                       active=FlagColumn(),
+                       last_payment=NumberColumn('i'))  # date ordinal, 0 if never paid
+
+
+def new_teacher_store():
+    return RecordStore(keys=('id',),
+                       id=NumberColumn('q'),
+                       name=TextColumn(),
+                       email=TextColumn(),
+                       role=CategoryColumn('Teacher'),
+                       status=CategoryColumn('Active'))
+
+
+class ClassRollups:
+    # Running per-class totals. Every change to a student is applied as
+    # remove(old state) + add(new state), so nothing is ever recounted.
+    def __init__(self):
+        self.classes = {}
+
+    def _totals(self, class_name):
+        totals = self.classes.get(class_name)
+        if totals is None:
+            totals = self.classes[class_name] = {'students': 0, 'active': 0, 'collected': 0.0, 'outstanding': 0.0}
+        return totals
+
+    def add(self, student, sign=1):
+        totals = self._totals(student['class'])
+        totals['students'] += sign
+        if student.get('active', True):
+            totals['active'] += sign
+        totals['collected'] += sign * student['fees_paid']
+        totals['outstanding'] += sign * max(student['fees_due'], 0)
+
+    def remove(self, student):
+        self.add(student, -1)
+
+    def add_many(self, students):
+        for student in students:
+            self.add(student)
+
+    def school(self):
+        # Sums the few class rows, not the students
+        school = {'students': 0, 'active': 0, 'collected': 0.0, 'outstanding': 0.0}
+        for totals in self.classes.values():
+            for key in school:
+                school[key] += totals[key]
+        return school
+
+
+class TrigramIndex:
+    # In-memory substring index: each record's searchable text is split into
+    # 3-character grams, and a query only looks at the records that contain
+    # its rarest grams instead of scanning the whole roster.
+    # Postings are append-only arrays of keys; changed or removed records are
+    # filtered out when candidates are verified against their current text.
+    GRAM = 3
+
+    def __init__(self):
+        self._postings = {}
+        self._texts = {}
+        # Searches run on a worker thread while the UI thread keeps adding rows
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._texts)
+
+    def clear(self):
+        with self._lock:
+            self._postings = {}
+            self._texts = {}
+
+    @classmethod
+    def prepare(cls, *fields):
+        # Lowercased text and gram set of a record. This is the expensive part
+        # of indexing and touches no shared state, so bulk loads run it on
+        # their worker thread. Fields are joined with a separator no query
+        # contains, so a match can never span two fields.
+        text = '\x00'.join(field.lower() for field in fields)
+        return text, {text[i:i + cls.GRAM] for i in range(len(text) - cls.GRAM + 1)}
+
+    def add(self, key, *fields):
+        self.add_many([(key, self.prepare(*fields))])
+
+    def add_many(self, entries):
+        # entries: (key, prepared) pairs, prepared coming from prepare()
+        with self._lock:
+            texts = self._texts
+            postings = self._postings
+            for key, (text, grams) in entries:
+                texts[key] = text
+                for gram in grams:
+                    try:
+                        postings[gram].append(key)
+                    except KeyError:
+                        postings[gram] = array('q', (key,))
+
+    def remove(self, key):
+        with self._lock:
+            self._texts.pop(key, None)
+
+    def search(self, query):
+        # Returns the matching keys in the order they were added
+        with self._lock:
+            return self._search(query.lower())
+
+    def _search(self, query):
+        texts = self._texts
+        if len(query) < self.GRAM:
+            return [key for key, text in texts.items() if query in text]
+
+        grams = {query[i:i + self.GRAM] for i in range(len(query) - self.GRAM + 1)}
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        # Intersect from the rarest gram up, then verify the survivors
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        return sorted(key for key in candidates if query in texts.get(key, ''))
+
+
+class UniformRowLayout(RecycleLayoutManagerBehavior, Layout):
+    # RecycleView layout manager for rows that all have the same height.
+    # RecycleBoxLayout keeps sizing/position bookkeeping for every data item,
+    # which costs seconds once a table has 100k+ rows; here a row's position
+    # follows from its index, so data changes and scrolling only cost as much
+    # as the rows on screen.
+    row_height = NumericProperty(dp(40))
+    spacing = NumericProperty(dp(5))
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.size_hint_y = None
+        self.view_indices = {}
+        self.fbind('pos', self._trigger_layout)
+        self.fbind('size', self._trigger_layout)
+
+    def do_layout(self, *largs):
+        rv = self.recycleview
+        if rv is not None:
+            rv.refresh_from_layout()
+
+    def _row_top(self, index):
+        return self.top - index * (self.row_height + self.spacing)
+
+    def compute_sizes_from_data(self, data, flags):
+        # Any data change may have changed what a view shows
+        self.clear_layout()
+
+    def compute_layout(self, data, flags):
+        step = self.row_height + self.spacing
+        self.height = max(0, len(data) * step - self.spacing)
+
+    def get_view_index_at(self, pos):
+        step = self.row_height + self.spacing
+        return max(0, int((self.top - pos[1]) // step))
+
+    def compute_visible_views(self, data, viewport):
+        if not data:
+            return []
+        x, y, w, h = viewport
+        first = self.get_view_index_at((x, y + h))
+        last = min(len(data) - 1, self.get_view_index_at((x, y)))
+        return list(range(first, last + 1))
+
+    def set_visible_views(self, indices, data, viewport):
+        viewclasses = _UniformViewclass(self.viewclass)
+        new, remaining, old = self.recycleview.view_adapter.set_visible_views(indices, data, viewclasses)
+
+        view_indices = self.view_indices
+        for _, widget in old:
+            self.remove_widget(widget)
+            view_indices.pop(widget, None)
+
+        row_height = self.row_height
+        for index, widget in new:
+            layout = {'size': [self.width, row_height],
+                      'pos': [self.x, self._row_top(index) - row_height]}
+            self.refresh_view_layout(index, layout, widget, viewport)
+            view_indices[widget] = index
+            if widget.parent is None:
+                self.add_widget(widget)
+
+        # Rows stay attached across data changes and are rebound in place;
+        # only the ones no longer needed on screen are detached
+        for widget in [child for child in self.children if child not in view_indices]:
+            self.remove_widget(widget)
+
+    def remove_views(self):
+        super().remove_views()
+        self.clear_widgets()
+        self.view_indices = {}
+
+    def remove_view(self, view, index):
+        super().remove_view(view, index)
+        self.remove_widget(view)
+        del self.view_indices[view]
+
+    def clear_layout(self):
+        # The views go back to the adapter's cache but stay our children, so
+        # the next set_visible_views can reuse them without re-adding them
+        super().clear_layout()
+        self.view_indices = {}
+
+
+class _UniformViewclass:
+    # Stands in for RecycleLayout.view_opts: every index uses the same viewclass
+    def __init__(self, viewclass):
+        self.opts = {'viewclass': viewclass}
+
+    def __getitem__(self, index):
+        return self.opts
+
+
+class RowSourceModel(RecycleDataModelBehavior, EventDispatcher):
+    # Serves the grid straight from any row sequence (a RecordSelection)
+    # instead of copying it into an observable list of dicts
+    data = ObjectProperty([], force_dispatch=True)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.fbind('data', self._on_data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def attach_recycleview(self, rv):
+        super().attach_recycleview(rv)
+        if rv:
+            self.fbind('data', rv._dispatch_prop_on_source, 'data')
+
+    def detach_recycleview(self):
+        rv = self.recycleview
+        if rv:
+            self.funbind('data', rv._dispatch_prop_on_source, 'data')
+        super().detach_recycleview()
+
+    def _on_data(self, instance, value):
+        self.dispatch('on_data_changed')
+
+
+class RecordGrid(RecycleView):
+    # Virtualized table: widgets are only created for the rows on screen and
+    # are recycled while scrolling, so the row count does not matter
+    dashboard = ObjectProperty(None)
+    timing_name = StringProperty('')  # Histogram the data rebuilds are timed into, if set
+
+    def __init__(self, viewclass, row_height=dp(40), **kwargs):
+        kwargs.setdefault('data_model', RowSourceModel())
+        super().__init__(**kwargs)
+        self.bar_width = dp(8)
+        self.scroll_type = ['bars', 'content']
+
+        layout = UniformRowLayout(row_height=row_height)
+        self.add_widget(layout)
+        # viewclass lives on the layout manager, so it can only be set now
+        self.viewclass = viewclass
+
+    def refresh_views(self, *largs):
+        # Only passes that rebuild from new data are timed, not scrolling
+        if not self.timing_name or self.dashboard is None or not self._refresh_flags['data']:
+            return super().refresh_views(*largs)
+        with self.dashboard.timings.time(self.timing_name):
+            super().refresh_views(*largs)
+
+
+class LazyTabbedPanelItem(TabbedPanelItem):
+    # A tab whose content is only created, by calling `builder`, when it is
+    # first shown or prefetched
+    builder = ObjectProperty(None, allownone=True)
+
+    def build_content(self):
+        if self.builder is not None:
+            builder, self.builder = self.builder, None
+            self.add_widget(builder())
+
+
+class LazyTabbedPanel(TabbedPanel):
+    def switch_to(self, header, do_scroll=False):
+        # Build the content before TabbedPanel reads header.content
+        if isinstance(header, LazyTabbedPanelItem):
+            header.build_content()
+        super().switch_to(header, do_scroll=do_scroll)
+
+
+class WidgetPool:
+    # Keeps released widgets for reuse instead of building new ones; the
+    # widget's own update method rebinds it to its next record
+    def __init__(self, factory, limit=64):
+        self.factory = factory
+        self.limit = limit
+        self._free = []
+
+    def acquire(self):
+        return self._free.pop() if self._free else self.factory()
+
+    def release(self, widget):
+        if widget.parent is not None:
+            widget.parent.remove_widget(widget)
+        if len(self._free) < self.limit:
+            self._free.append(widget)
+
+
+class TeacherRow(BoxLayout):
+    # One keyed row of the teacher grid; update() only touches changed labels
+    def __init__(self, dashboard, **kwargs):
+        super().__init__(**kwargs)
+        self.size_hint_y = None
+        self.height = dp(40)
+        self.spacing = dp(5)
+        self.dashboard = dashboard
+        self.teacher = None
+        self._shown = None
+
+        self.name_label = Label()
+        self.email_label = Label()
+        self.role_label = Label()
+        for label in (self.name_label, self.email_label, self.role_label):
+            self.add_widget(label)
+
+        action_box = BoxLayout(spacing=dp(5))
+        edit_btn = Button(text='Edit',
+                          size_hint_x=0.3,
+                          background_color=(0.2, 0.6, 1, 1),  # Blue color
+                          background_normal='',
+                          color=(1, 1, 1, 1))  # White text
+        disable_btn = Button(text='Disable',
+                             size_hint_x=0.3,
+                             background_color=(1, 0.4, 0.4, 1),  # Red color
+                             background_normal='',
+                             color=(1, 1, 1, 1))  # White text
+        delete_btn = Button(text='Delete',
+                            size_hint_x=0.3,
+                            background_color=(1, 0.4, 0.4, 1),  # Red color
+                            background_normal='',
+                            color=(1, 1, 1, 1))  # White text
+
+        edit_btn.bind(on_press=lambda x: self.dashboard.edit_teacher(self.teacher))
+        disable_btn.bind(on_press=lambda x: self.dashboard.disable_teacher(self.teacher))
+        delete_btn.bind(on_press=lambda x: self.dashboard.delete_teacher(self.teacher))
+
+        action_box.add_widget(edit_btn)
+        action_box.add_widget(disable_btn)
+        action_box.add_widget(delete_btn)
+        self.add_widget(action_box)
+
+    def release(self):
+        # Drop the record while pooled; the labels keep their text so an
+        # identical record later needs no redraw
+        self.teacher = None
+
+    def update(self, teacher):
+        self.teacher = teacher
+        shown = (teacher['name'], teacher['email'], teacher['role'])
+        if shown == self._shown:
+            return
+        self._shown = shown
+        self.name_label.text, self.email_label.text, self.role_label.text = shown
+
+
+class StudentRow(RecycleDataViewBehavior, BoxLayout):
+    # One row of the student grid, rebound to a new record on every recycle
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.spacing = dp(5)
+        self.student = None
+        self.dashboard = None
+
+        self.id_label = Label()
+        self.num_label = Label()
+        self.name_label = Label()
+        self.class_label = Label()
+        self.fees_label = Label()
+        self.status_label = Label()
+        for label in (self.id_label, self.num_label, self.name_label, self.class_label, self.fees_label,
+                      self.status_label):
+            self.add_widget(label)
+
+        # Actions - red/green disable button and blue assign class button
+        action_box = BoxLayout(spacing=dp(5))
+        self.disable_btn = Button(size_hint_x=0.4,
+                                  background_normal='',
+                                  color=(1, 1, 1, 1))
+        assign_btn = Button(text='Assign Class',
+                            size_hint_x=0.6,
+                            background_color=(0.2, 0.6, 1, 1),
+                            background_normal='',
+                            color=(1, 1, 1, 1))
+
+        # Bound once; the handlers act on whatever record the row shows now
+        self.disable_btn.bind(on_press=lambda x: self.dashboard.toggle_student_status(self.student))
+        assign_btn.bind(on_press=lambda x: self.dashboard.assign_student_class(self.student))
+
+        action_box.add_widget(self.disable_btn)
+        action_box.add_widget(assign_btn)
+        self.add_widget(action_box)
+
+    def refresh_view_attrs(self, rv, index, data):
+        # data is a RecordView onto the student's row; nothing is copied
+        self.dashboard = rv.dashboard
+        self.student = student = data
+
+        self.id_label.text = str(student['id'])
+        self.num_label.text = student.get('student_number', 'N/A')
+        self.name_label.text = student['name']
+        self.class_label.text = student['class']
+        self.fees_label.text = f"KES {student['fees_paid']:,.0f}"  # Format with commas
+
+        active = student.get('active', True)
+        self.status_label.text = 'Active' if active else 'Disabled'
+        self.disable_btn.text = 'Disable' if active else 'Enable'
+        self.disable_btn.background_color = (1, 0.4, 0.4, 1) if active else (0.2, 0.7, 0.3, 1)
+
+
+def fee_status(fees_due):
+    return 'Paid' if fees_due <= 0 else 'Pending'
+
+
+class FeeRow(RecycleDataViewBehavior, BoxLayout):
+    # One row of the fee grid; the status button is recycled with the row
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.spacing = dp(5)
+        self.student = None
+        self.dashboard = None
+
+        self.id_label = Label()
+        self.name_label = Label()
+        self.class_label = Label()
+        self.amount_label = Label()
+        for label in (self.id_label, self.name_label, self.class_label, self.amount_label):
+            self.add_widget(label)
+
+        # Status with colored background
+        self.status_btn = Button(background_normal='',
+                                 color=(1, 1, 1, 1))  # White text
+        self.status_btn.bind(on_press=lambda x: self.dashboard.view_fee_details(self.student))
+        self.add_widget(self.status_btn)
+
+    def refresh_view_attrs(self, rv, index, data):
+        # data is a RecordView onto the student's row; nothing is copied
+        self.dashboard = rv.dashboard
+        self.student = student = data
+
+        self.id_label.text = student.get('student_number', 'N/A')
+        self.name_label.text = student['name']
+        self.class_label.text = student['class']
+        self.amount_label.text = f"KES {student['fees_paid']:,.0f}/{student['fees_paid'] + student['fees_due']:,.0f}"
+
+        self.status_btn.text = status = fee_status(student['fees_due'])
+        self.status_btn.background_color = (0.2, 0.7, 0.3, 1) if status == 'Paid' else (1, 0.4, 0.4, 1)  # Green/Red
+
+
+# Columns written by the grids' exports, as (header, getter) pairs
+STUDENT_EXPORT_COLUMNS = [
+    ('ID', lambda student: student['id']),
+    ('Student Number', lambda student: student['student_number']),
+    ('Name', lambda student: student['name']),
+    ('Class', lambda student: student['class']),
+    ('Fees Paid', lambda student: student['fees_paid']),
+    ('Fees Due', lambda student: student['fees_due']),
+    ('Status', lambda student: 'Active' if student['active'] else 'Disabled')
+]
+FEE_EXPORT_COLUMNS = [
+    ('Student Number', lambda student: student['student_number']),
+    ('Name', lambda student: student['name']),
+    ('Class', lambda student: student['class']),
+    ('Fees Paid', lambda student: student['fees_paid']),
+    ('Total Billed', lambda student: student['fees_paid'] + student['fees_due']),
+    ('Balance', lambda student: student['fees_due']),
+    ('Status', lambda student: fee_status(student['fees_due'])),
+    ('Last Payment', lambda student: date.fromordinal(student['last_payment']).isoformat()
+     if student['last_payment'] else '')
+]
+
+# Grid headers that sort when clicked, and the store column each sorts by
+SORT_COLUMNS = {
+    'students': {'ID': 'id', 'Student #': 'student_number', 'Name': 'name', 'Class': 'class',
+                 'Fees Paid': 'fees_paid', 'Status': 'active'},
+    'fees': {'ID': 'student_number', 'Student': 'name', 'Class': 'class', 'Amount': 'fees_paid',
+             'Status': 'fees_due'}
+}
+SORT_TRANSFORMS = {'student_number': str.casefold, 'name': str.casefold, 'class': str.casefold}
+
+
+class LogRow(RecycleDataViewBehavior, BoxLayout):
+    # One event of the system log
+    LEVEL_COLORS = {'INFO': (0.3, 0.3, 0.3, 1), 'WARNING': (0.9, 0.6, 0.1, 1), 'ERROR': (1, 0.4, 0.4, 1)}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.spacing = dp(5)
+        self.time_label = Label(size_hint_x=0.2, color=(0.5, 0.5, 0.5, 1))
+        self.level_label = Label(size_hint_x=0.1, bold=True)
+        self.source_label = Label(size_hint_x=0.1, color=(0.5, 0.5, 0.5, 1))
+        self.message_label = Label(size_hint_x=0.6, halign='left', valign='middle', shorten=True)
+        self.message_label.bind(size=self.message_label.setter('text_size'))
+        for label in (self.time_label, self.level_label, self.source_label, self.message_label):
+            self.add_widget(label)
+
+    def refresh_view_attrs(self, rv, index, data):
+        # data is a LogEvent tuple
+        self.time_label.text = datetime.fromtimestamp(data.created).strftime('%Y-%m-%d %H:%M:%S')
+        self.level_label.text = data.level
+        self.level_label.color = self.LEVEL_COLORS[data.level]
+        self.source_label.text = data.source
+        self.message_label.text = data.message
 
 
 class AdminDashboard(Screen):
     current_user = ObjectProperty(None)
+    database = ObjectProperty(None)
     status_message = StringProperty("")
-    teacher_list = ListProperty([])
-    student_list = ListProperty([])
     class_list = ListProperty([])
     subject_list = ListProperty([])
 
-    def __init__(self, **kwargs):
+    SEARCH_DEBOUNCE = 0.25  # seconds of typing pause before a live search runs
+    IMPORT_FRAME_BUDGET = 0.010  # seconds per frame spent committing imported rows
+    PAGE_ROWS = 100  # rows per grid page
+    # Filter bar choices; the first of each filters nothing
+    FEE_FILTERS = ['All fees', 'Pending', 'Paid']
+    STATUS_FILTERS = {'All students': (), 'Active': (True,), 'Disabled': (False,)}
+    # System log level filter choices, by the lowest level each one shows
+    LOG_LEVELS = {'All levels': 'INFO', 'Warnings and errors': 'WARNING', 'Errors only': 'ERROR'}
+    TAB_PREFETCH_DELAY = 1.0  # seconds between idle builds of unopened tabs; None to disable
+
+    def __init__(self, snapshot=None, **kwargs):
         super().__init__(**kwargs)
         self.name = 'admin_dashboard'
+        # A model loaded ahead of time (see load_snapshot), used instead of
+        # reading the database again when the dashboard is built
+        self._preloaded = snapshot
+        self._search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='search')
+        self._search_generations = {}
+        self._search_futures = {}
+        self.timings = Timings()  # Hot-path timing histograms, shown under System Logs
+        # Every reported action, newest last; the log view shows a filtered
+        # copy only while a filter is set (None otherwise)
+        self.event_log = EventLog()
+        self.log_rv = None
+        self._log_level = 'INFO'
+        self._log_text = ''
+        self._log_matches = None
+        # Widgets of tabs that have not been built yet
+        self.teacher_grid = None
+        self.student_rv = None
+        self.fee_rv = None
+        self.summary_label = None
+        # Per grid: the search result (or all students) and its bitmap, the
+        # filters, the bitmap of the rows left after filtering (None: every
+        # student), the sort column (None: the order rows were added in) and
+        # direction, and the sort key of the page's first row, which pins the
+        # page. Each filter holds the values it accepts, any of them, and the
+        # filters must all match.
+        self._grid_pages = {table: {'search': None, 'search_bitmap': None, 'bitmap': None,
+                                    'sort': None, 'descending': False,
+                                    'anchor': None, 'ordered': None, 'headers': {}, 'pager_label': None,
+                                    'filters': {'class': (), 'fee_status': (), 'active': (), 'balance': None}}
+                            for table in ('students', 'fees')}
+        self._filter_inputs = {}
+        self._balance_bitmap = None  # (threshold, index, index version, bitmap) of the last balance filter
+        self._teacher_row_pool = WidgetPool(lambda: TeacherRow(dashboard=self))
+        self._assign_popup = None
+        self._import_job = None
+        self._export_job = None
+        self._export_event = None
+        self._refreshing = False
+        self.status_bar = None
+
+        # Change notifications, coalesced to at most one flush per frame
+        self._pending_changes = set()
+        self._batch_depth = 0
+        self._flush_trigger = Clock.create_trigger(self._flush_changes)
+        self.fbind('status_message', lambda *args: self.notify('status'))
         Clock.schedule_once(self._finish_init)
 
     def _finish_init(self, dt):
-        self.load_sample_data()
+        if self.database is None:
+            self.database = SchoolDatabase()
+        self.event_log.spill_to(os.path.join(os.path.dirname(os.path.abspath(self.database.path)),
+                                             'school_events.log'))
+        snapshot, self._preloaded = self._preloaded, None
+        if snapshot is not None and snapshot['writes'] == self.database.writes:
+            self._apply_snapshot(snapshot)
+        else:
+            self.load_data()
         self.build_ui()
 
-    def load_sample_data(self):
-        # Sample data - replace with database calls
-        self.teacher_list = [
-            {'id': 1, 'name': 'John Smith', 'email': 'john@school.edu', 'role': 'Teacher', 'status': 'Active'},
-            {'id': 2, 'name': 'Sarah Johnson', 'email': 'sarah@school.edu', 'role': 'DoS', 'status': 'Active'}
-        ]
-
-        self.student_list = [
-            {'id': 1001, 'student_number': 'S2023001', 'name': 'Michael Brown', 'class': 'Grade 10A', 'fees_paid': 1500,
-             'fees_due': 500},
-            {'id': 1002, 'student_number': 'S2023002', 'name': 'Emily Davis', 'class': 'Grade 9B', 'fees_paid': 2000,
-             'fees_due': 0}
-        ]
-
-        self.class_list = ['Grade 10A', 'Grade 10B', 'Grade 9A', 'Grade 9B']
-        self.subject_list = ['Math', 'Science', 'English', 'History']
+    def load_data(self):
+        self._apply_snapshot(self.load_snapshot(self.database))
+
+    @classmethod
+    def load_snapshot(cls, database):
+        # Builds a complete model from the database without touching any
+        # dashboard, so it can run on a worker thread - even before the
+        # dashboard itself exists
+        writes = database.writes
+
+        # Records live in column stores; the dicts the database returns are
+        # only kept until they are copied in, a page at a time
+        teachers = new_teacher_store()
+        teachers.extend(database.load_teachers())
+        students = new_student_store()
+        class_rollups = ClassRollups()
+        for page in database.iter_student_pages():
+            students.extend(page)
+            class_rollups.add_many(page)
+
+        return {'teachers': teachers,
+                'students': students,
+                'class_rollups': class_rollups,
+                'search_index': cls._build_search_index(students),
+                'class_list': database.load_classes(),
+                'subject_list': database.load_subjects(),
+                'writes': writes}
+
+    def _apply_snapshot(self, snapshot):
+        self.teachers = snapshot['teachers']
+        self.students = snapshot['students']
+        self.class_rollups = snapshot['class_rollups']
+        self.search_index = snapshot['search_index']
+        self.class_list = snapshot['class_list']
+        self.subject_list = snapshot['subject_list']
+        self.notify('summary')
+
+    @classmethod
+    def _build_search_index(cls, students):
+        # Keys are positions in the student store, which never change
+        index = TrigramIndex()
+        index.add_many((student.position, cls._student_search_entry(student)) for student in students)
+        return index
+
+    def _index_student(self, position, student):
+        self.search_index.add_many([(position, self._student_search_entry(student))])
+
+    @staticmethod
+    def _student_search_entry(student):
+        return TrigramIndex.prepare(student['name'], student.get('student_number', ''))
 
     def build_ui(self):
         self.clear_widgets()
@@ -72,7 +1223,7 @@ class AdminDashboard(Screen):
         main_layout.add_widget(header)
 
         # Tabbed interface
-        self.tabs = TabbedPanel(
+        self.tabs = LazyTabbedPanel(
             do_default_tab=False,
             tab_width=dp(200),
             background_color=(0.95, 0.95, 0.95, 1)
@@ -101,17 +1252,23 @@ class AdminDashboard(Screen):
         user_box = BoxLayout(orientation='horizontal', spacing=dp(15))
 
         text_box = BoxLayout(orientation='vertical', spacing=dp(5))
-        text_box.add_widget(Label(
-            text=f"Welcome, {getattr(self.current_user, 'full_name', 'Administrator')}",
+        # Kept current: a preloaded dashboard is built before anyone logs in
+        welcome_label = Label(
             font_size=dp(18),
             bold=True,
             halign='left'
-        ))
+        )
+        self.fbind('current_user', self._update_welcome, welcome_label)
+        self._update_welcome(welcome_label)
+        text_box.add_widget(welcome_label)
         text_box.add_widget(Label(
             text="Admin Dashboard",
             font_size=dp(14),
             color=(0.5, 0.5, 0.5, 1)
         ))
+        self.summary_label = Label(font_size=dp(12), color=(0.5, 0.5, 0.5, 1))
+        text_box.add_widget(self.summary_label)
+        self.notify('summary')
 
         user_box.add_widget(text_box)
 
@@ -132,36 +1289,79 @@ class AdminDashboard(Screen):
         header.add_widget(actions)
         return header
 
+    def _update_welcome(self, label, *args):
+        label.text = f"Welcome, {getattr(self.current_user, 'full_name', 'Administrator')}"
+
     def _add_tabs(self):
-        # 1. User Management Tab
-        user_tab = TabbedPanelItem(text='User Management')
-        user_content = self._create_user_management_tab()
-        user_tab.add_widget(user_content)
-        self.tabs.add_widget(user_tab)
-
-        # 2. Academic Management Tab
-        academic_tab = TabbedPanelItem(text='Academic Management')
-        academic_content = self._create_academic_management_tab()
-        academic_tab.add_widget(academic_content)
-        self.tabs.add_widget(academic_tab)
-
-        # 3. Student Management Tab
-        student_tab = TabbedPanelItem(text='Student Management')
-        student_content = self._create_student_management_tab()
-        student_tab.add_widget(student_content)
-        self.tabs.add_widget(student_tab)
-
-        # 4. Financial Management Tab
-        finance_tab = TabbedPanelItem(text='Financial Management')
-        finance_content = self._create_financial_management_tab()
-        finance_tab.add_widget(finance_content)
-        self.tabs.add_widget(finance_tab)
-
-        # 5. Reports Tab
-        reports_tab = TabbedPanelItem(text='Reports')
-        reports_content = self._create_reports_tab()
-        reports_tab.add_widget(reports_content)
-        self.tabs.add_widget(reports_tab)
+        # Only the tab headers are created here; each tab's content is built
+        # when it is first selected, or prefetched while the app is idle
+        self.tab_items = {}
+        for title, builder in [('User Management', self._create_user_management_tab),
+                               ('Academic Management', self._create_academic_management_tab),
+                               ('Student Management', self._create_student_management_tab),
+                               ('Financial Management', self._create_financial_management_tab),
+                               ('Reports', self._create_reports_tab)]:
+            tab = LazyTabbedPanelItem(text=title, builder=self._timed_tab(title, builder))
+            self.tab_items[title] = tab
+            self.tabs.add_widget(tab)
+
+        if self.TAB_PREFETCH_DELAY is not None:
+            Clock.schedule_once(self._prefetch_tab, self.TAB_PREFETCH_DELAY)
+
+    def _timed_tab(self, title, builder):
+        def build():
+            with self.timings.time(f"Tab: {title}"):
+                return builder()
+        return build
+
+    def _prefetch_tab(self, dt):
+        # Build one unopened tab per idle slot so no single frame pays for all
+        # of them; a running import keeps the frames to itself
+        if not self._import_running():
+            pending = [tab for tab in self.tab_items.values() if tab.builder is not None]
+            if not pending:
+                return
+            pending[0].build_content()
+        Clock.schedule_once(self._prefetch_tab, self.TAB_PREFETCH_DELAY)
+
+    def _build_grid_header(self, headers, table=None):
+        # Given a table, its SORT_COLUMNS headers are buttons that sort the grid
+        header = BoxLayout(size_hint=(1, None), height=dp(40), spacing=dp(5))
+        sortable = SORT_COLUMNS.get(table, {})
+        for text in headers:
+            if text not in sortable:
+                header.add_widget(Label(text=text, bold=True))
+                continue
+            # Transparent, so sortable headers look like the others
+            sort_btn = Button(text=text, bold=True,
+                              background_color=(0, 0, 0, 0),
+                              background_normal='',
+                              color=(1, 1, 1, 1))
+            sort_btn.bind(on_press=lambda x, column=sortable[text]: self.sort_grid(table, column))
+            self._grid_pages[table]['headers'][text] = sort_btn
+            header.add_widget(sort_btn)
+        return header
+
+    def _build_pager(self, table):
+        pager = BoxLayout(size_hint=(1, None), height=dp(40), spacing=dp(10))
+        for text, step in (('First', 'first'), ('Prev', 'prev')):
+            page_btn = Button(text=text, size_hint_x=0.12,
+                              background_color=(0.2, 0.6, 1, 1),
+                              background_normal='',
+                              color=(1, 1, 1, 1))
+            page_btn.bind(on_press=lambda x, step=step: self.turn_page(table, step))
+            pager.add_widget(page_btn)
+        page_label = Label(size_hint_x=0.52)
+        self._grid_pages[table]['pager_label'] = page_label
+        pager.add_widget(page_label)
+        for text, step in (('Next', 'next'), ('Last', 'last')):
+            page_btn = Button(text=text, size_hint_x=0.12,
+                              background_color=(0.2, 0.6, 1, 1),
+                              background_normal='',
+                              color=(1, 1, 1, 1))
+            page_btn.bind(on_press=lambda x, step=step: self.turn_page(table, step))
+            pager.add_widget(page_btn)
+        return pager
 
     # 1. User Management Functions
     def _create_user_management_tab(self):
@@ -171,47 +1371,16 @@ class AdminDashboard(Screen):
         teacher_box = BoxLayout(orientation='vertical', spacing=dp(10))
         teacher_box.add_widget(Label(text='Teacher Accounts', size_hint=(1, None), height=dp(30)))
 
-        # Teacher list
-        scroll = ScrollView()
-        self.teacher_grid = GridLayout(cols=4, size_hint_y=None, spacing=dp(5))
-        self.teacher_grid.bind(minimum_height=self.teacher_grid.setter('height'))
-
         # Header row
         headers = ['Name', 'Email', 'Role', 'Actions']
-        for header in headers:
-            self.teacher_grid.add_widget(Label(text=header, size_hint_y=None, height=dp(40), bold=True))
-
-        # Teacher rows
-        for teacher in self.teacher_list:
-            self.teacher_grid.add_widget(Label(text=teacher['name'], size_hint_y=None, height=dp(40)))
-            self.teacher_grid.add_widget(Label(text=teacher['email'], size_hint_y=None, height=dp(40)))
-            self.teacher_grid.add_widget(Label(text=teacher['role'], size_hint_y=None, height=dp(40)))
+        teacher_box.add_widget(self._build_grid_header(headers))
 
-            action_box = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(5))
-            edit_btn = Button(text='Edit',
-                              size_hint_x=0.3,
-                              background_color=(0.2, 0.6, 1, 1),  # Blue color
-                              background_normal='',
-                              color=(1, 1, 1, 1))  # White text
-            disable_btn = Button(text='Disable',
-                                 size_hint_x=0.3,
-                                 background_color=(1, 0.4, 0.4, 1),  # Red color
-                                 background_normal='',
-                                 color=(1, 1, 1, 1))  # White text
-            delete_btn = Button(text='Delete',
-                                size_hint_x=0.3,
-                                background_color=(1, 0.4, 0.4, 1),  # Red color
-                                background_normal='',
-                                color=(1, 1, 1, 1))  # White text
-
-            edit_btn.bind(on_press=lambda x, t=teacher: self.edit_teacher(t))
-            disable_btn.bind(on_press=lambda x, t=teacher: self.disable_teacher(t))
-            delete_btn.bind(on_press=lambda x, t=teacher: self.delete_teacher(t))
-
-            action_box.add_widget(edit_btn)
-            action_box.add_widget(disable_btn)
-            action_box.add_widget(delete_btn)
-            self.teacher_grid.add_widget(action_box)
+        # Teacher list - one keyed row per teacher so edits only touch that row
+        scroll = ScrollView()
+        self.teacher_grid = GridLayout(cols=1, size_hint_y=None, spacing=dp(5))
+        self.teacher_grid.bind(minimum_height=self.teacher_grid.setter('height'))
+        self._teacher_rows = {}
+        self.refresh_teacher_list()
 
         # Add the grid to scroll view ONCE
         scroll.add_widget(self.teacher_grid)
@@ -302,11 +1471,10 @@ class AdminDashboard(Screen):
             teacher['role'] = role_spinner.text
             teacher['status'] = status_spinner.text
 
-            # Here you would typically save to database
             self.update_teacher_in_database(teacher)
 
-            # Refresh the teacher list display
-            self.refresh_teacher_list()
+            # Refresh the teacher's row in the list display
+            self._patch_teacher_row(teacher)
             popup.dismiss()
 
         def cancel_edit(instance):
@@ -320,117 +1488,97 @@ class AdminDashboard(Screen):
 
     def add_teacher(self, instance):
         new_teacher = {
-            'id': len(self.teacher_list) + 1,
             'name': self.new_teacher_name.text,
             'email': self.new_teacher_email.text,
             'role': self.new_teacher_role.text,
             'status': 'Active'
         }
-        self.teacher_list.append(new_teacher)
-        self.refresh_teacher_list()
-        self.status_message = f"Added teacher: {new_teacher['name']}"
+        self.database.add_teacher(new_teacher)
+        position = self.teachers.append(new_teacher)
+        self._insert_teacher_row(self.teachers[position])
+        self.report(f"Added teacher: {new_teacher['name']}", 'teachers')
         self.new_teacher_name.text = ''
         self.new_teacher_email.text = ''
 
     def edit_teacher(self, teacher):
-        self.status_message = f"Editing teacher: {teacher['name']}"
-        # Implement edit functionality
+        self.report(f"Editing teacher: {teacher['name']}", 'teachers')
+        self.create_edit_teacher_dialog(teacher)
+
+    def update_teacher_in_database(self, teacher):
+        self.database.update_teacher(teacher)
+        self.report(f"Updated teacher: {teacher['name']}", 'teachers')
 
     def disable_teacher(self, teacher):
-        self.status_message = f"Disabling teacher: {teacher['name']} for 30 days"
+        self.report(f"Disabling teacher: {teacher['name']} for 30 days", 'teachers')
         # Implement disable functionality with time period
 
     def delete_teacher(self, teacher):
-        self.status_message = f"Deleted teacher: {teacher['name']}"
-        self.teacher_list = [t for t in self.teacher_list if t['id'] != teacher['id']]
-        self.refresh_teacher_list()
+        self.database.delete_teacher(teacher['id'])
+        self.report(f"Deleted teacher: {teacher['name']}", 'teachers')
+        self.teachers.remove(teacher.position)
+        self._remove_teacher_row(teacher['id'])
 
     def refresh_teacher_list(self):
-        self.teacher_grid.clear_widgets()
-        headers = ['Name', 'Email', 'Role', 'Actions']
-        for header in headers:
-            self.teacher_grid.add_widget(Label(text=header, size_hint_y=None, height=dp(40), bold=True))
-
-        for teacher in self.teacher_list:
-            self.teacher_grid.add_widget(Label(text=teacher['name'], size_hint_y=None, height=dp(40)))
-            self.teacher_grid.add_widget(Label(text=teacher['email'], size_hint_y=None, height=dp(40)))
-            self.teacher_grid.add_widget(Label(text=teacher['role'], size_hint_y=None, height=dp(40)))
-
-            action_box = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(5))
-            edit_btn = Button(text='Edit', size_hint_x=0.3)
-            disable_btn = Button(text='Disable', size_hint_x=0.3)
-            delete_btn = Button(text='Delete', size_hint_x=0.3)
-
-            edit_btn.bind(on_press=lambda x, t=teacher: self.edit_teacher(t))
-            disable_btn.bind(on_press=lambda x, t=teacher: self.disable_teacher(t))
-            delete_btn.bind(on_press=lambda x, t=teacher: self.delete_teacher(t))
-
-            action_box.add_widget(edit_btn)
-            action_box.add_widget(disable_btn)
-            action_box.add_widget(delete_btn)
-            self.teacher_grid.add_widget(action_box)
-
-            # 2. Academic Management Functions
-
-
-
-
-        # Rebuild the grid (you might want to reuse your existing code)
-        headers = ['Name', 'Email', 'Role', 'Actions']
-        for header in headers:
-            self.teacher_grid.add_widget(Label(text=header, size_hint_y=None, height=dp(40), bold=True))
-
-        for teacher in self.teacher_list:
-            self.teacher_grid.add_widget(Label(text=teacher['name'], size_hint_y=None, height=dp(40)))
-            self.teacher_grid.add_widget(Label(text=teacher['email'], size_hint_y=None, height=dp(40)))
-            self.teacher_grid.add_widget(Label(text=teacher['role'], size_hint_y=None, height=dp(40)))
-
-            action_box = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(5))
-            edit_btn = Button(text='Edit', size_hint_x=0.3,
-                              background_color=(0.2, 0.6, 1, 1),
-                              background_normal='',
-                              color=(1, 1, 1, 1))
-            disable_btn = Button(text='Disable', size_hint_x=0.3,
-                                 background_color=(1, 0.4, 0.4, 1),
-                                 background_normal='',
-                                 color=(1, 1, 1, 1))
-            delete_btn = Button(text='Delete', size_hint_x=0.3,
-                                background_color=(1, 0.4, 0.4, 1),
-                                background_normal='',
-                                color=(1, 1, 1, 1))
-
-            edit_btn.bind(on_press=lambda x, t=teacher: self.edit_teacher(t))
-            disable_btn.bind(on_press=lambda x, t=teacher: self.disable_teacher(t))
-            delete_btn.bind(on_press=lambda x, t=teacher: self.delete_teacher(t))
-
-            action_box.add_widget(edit_btn)
-            action_box.add_widget(disable_btn)
-            action_box.add_widget(delete_btn)
-            self.teacher_grid.add_widget(action_box)
+        if self.teacher_grid is None:
+            return  # Built from the teacher store when the tab is first opened
+        with self.timings.time('Grid: teachers'):
+            self._diff_teacher_rows()
+
+    def _diff_teacher_rows(self):
+        # Diff the keyed rows against the teacher store: drop rows that are
+        # gone, patch the ones that are still there and append the new ones
+        current_ids = {teacher['id'] for teacher in self.teachers}
+        for teacher_id in [tid for tid in self._teacher_rows if tid not in current_ids]:
+            self._remove_teacher_row(teacher_id)
+
+        for teacher in self.teachers:
+            if teacher['id'] in self._teacher_rows:
+                self._patch_teacher_row(teacher)
+            else:
+                self._insert_teacher_row(teacher)
+
+    def _insert_teacher_row(self, teacher):
+        row = self._teacher_row_pool.acquire()
+        row.update(teacher)
+        self._teacher_rows[teacher['id']] = row
+        self.teacher_grid.add_widget(row)
+
+    def _patch_teacher_row(self, teacher):
+        row = self._teacher_rows.get(teacher['id'])
+        if row is None:
+            self._insert_teacher_row(teacher)
+        else:
+            row.update(teacher)
+
+    def _remove_teacher_row(self, teacher_id):
+        row = self._teacher_rows.pop(teacher_id, None)
+        if row is not None:
+            row.release()
+            self._teacher_row_pool.release(row)
 
     def _create_academic_management_tab(self):
         # Create main tab panel with custom styling
-        tab_panel = TabbedPanel(do_default_tab=False,  # Disable the default tab
-                                tab_width=Window.width / 2,  # Equal width tabs
-                                background_color=(0.9, 0.9, 0.9, 1),  # Light gray background
-                                tab_pos='top_mid')  # Center tabs
+        tab_panel = LazyTabbedPanel(do_default_tab=False,  # Disable the default tab
+                                    tab_width=Window.width / 2,  # Equal width tabs
+                                    background_color=(0.9, 0.9, 0.9, 1),  # Light gray background
+                                    tab_pos='top_mid')  # Center tabs
 
         # Class Management Tab
-        class_tab = TabbedPanelItem(text='Class Management',
-                                    background_normal='',
-                                    background_color=(0.2, 0.6, 1, 1),  # Blue when inactive
-                                    color=(1, 1, 1, 1))  # White text
-        class_content = self._create_class_management_tab()
-        class_tab.add_widget(class_content)
+        class_tab = LazyTabbedPanelItem(text='Class Management',
+                                        builder=self._timed_tab('Class Management',
+                                                                self._create_class_management_tab),
+                                        background_normal='',
+                                        background_color=(0.2, 0.6, 1, 1),  # Blue when inactive
+                                        color=(1, 1, 1, 1))  # White text
         tab_panel.add_widget(class_tab)
 
         # Subject Management Tab
-        subject_tab = TabbedPanelItem(text='Subject Management',
-                                      background_normal='',
-                                      background_color=(0.2, 0.6, 1, 1),  # Blue when inactive
-                                      color=(1, 1, 1, 1))  # White text
-        subject_content = self._create_subject_management_tab()
-        subject_tab.add_widget(subject_content)
+        subject_tab = LazyTabbedPanelItem(text='Subject Management',
+                                          builder=self._timed_tab('Subject Management',
+                                                                  self._create_subject_management_tab),
+                                          background_normal='',
+                                          background_color=(0.2, 0.6, 1, 1),  # Blue when inactive
+                                          color=(1, 1, 1, 1))  # White text
         tab_panel.add_widget(subject_tab)
 
         # Set the first tab as active
@@ -556,14 +1704,16 @@ class AdminDashboard(Screen):
 
     def add_class(self, instance):
         if self.new_class_name.text:
+            self.database.add_class(self.new_class_name.text)
             self.class_list.append(self.new_class_name.text)
-            self.status_message = f"Added class: {self.new_class_name.text}"
+            self.report(f"Added class: {self.new_class_name.text}", 'academics')
             self.new_class_name.text = ''
 
     def add_subject(self, instance):
         if self.new_subject_name.text:
+            self.database.add_subject(self.new_subject_name.text)
             self.subject_list.append(self.new_subject_name.text)
-            self.status_message = f"Added subject: {self.new_subject_name.text}"
+            self.report(f"Added subject: {self.new_subject_name.text}", 'academics')
             self.new_subject_name.text = ''
 
     # 3. Student Management Functions
@@ -573,6 +1723,9 @@ class AdminDashboard(Screen):
         # Search bar with styled buttons
         search_box = BoxLayout(size_hint=(1, None), height=dp(50), spacing=dp(10))
         self.search_input = TextInput(hint_text='Search by name or student number', size_hint_x=0.7)
+        # Search as you type, once typing pauses
+        self._student_search_trigger = Clock.create_trigger(self.search_students, self.SEARCH_DEBOUNCE)
+        self.search_input.bind(text=lambda instance, text: self._student_search_trigger())
 
         # Blue search button
         search_btn = Button(text='Search',
@@ -595,72 +1748,21 @@ class AdminDashboard(Screen):
         search_box.add_widget(search_btn)
         search_box.add_widget(clear_btn)
         layout.add_widget(search_box)
+        layout.add_widget(self._build_filter_bar('students'))
 
         # Student list
         student_box = BoxLayout(orientation='vertical', spacing=dp(10))
         student_box.add_widget(Label(text='Student Records', size_hint=(1, None), height=dp(30)))
 
-        scroll = ScrollView()
-        self.student_grid = GridLayout(cols=6, size_hint_y=None, spacing=dp(5))
-        self.student_grid.bind(minimum_height=self.student_grid.setter('height'))
-
         # Header row
-        headers = ['ID', 'Student #', 'Name', 'Class', 'Fees Paid', 'Actions']
-        for header in headers:
-            label = Label(text=header, size_hint_y=None, height=dp(40), bold=True)
-            self.student_grid.add_widget(label)
-
-        # Student rows
-        for student in self.student_list:
-            # ID
-            id_label = Label(text=str(student['id']), size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(id_label)
-
-            # Student Number
-            num_label = Label(text=student.get('student_number', 'N/A'), size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(num_label)
-
-            # Name
-            name_label = Label(text=student['name'], size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(name_label)
-
-            # Class
-            class_label = Label(text=student['class'], size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(class_label)
-
-            # Fees Paid - Changed to KES
-            fees_label = Label(text=f"KES {student['fees_paid']:,}",  # Format with commas
-                               size_hint_y=None,
-                               height=dp(40))
-            self.student_grid.add_widget(fees_label)
-
-            # Actions - Changed Edit to Disable
-            action_box = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(5))
-
-            # Red disable button
-            disable_btn = Button(text='Disable' if student.get('active', True) else 'Enable',
-                                 size_hint_x=0.4,
-                                 background_color=(1, 0.4, 0.4, 1) if student.get('active', True) else (
-                                 0.2, 0.7, 0.3, 1),
-                                 background_normal='',
-                                 color=(1, 1, 1, 1))
-
-            # Blue assign class button
-            assign_btn = Button(text='Assign Class',
-                                size_hint_x=0.6,
-                                background_color=(0.2, 0.6, 1, 1),
-                                background_normal='',
-                                color=(1, 1, 1, 1))
-
-            disable_btn.bind(on_press=lambda x, s=student: self.toggle_student_status(s))
-            assign_btn.bind(on_press=lambda x, s=student: self.assign_student_class(s))
+        headers = ['ID', 'Student #', 'Name', 'Class', 'Fees Paid', 'Status', 'Actions']
+        student_box.add_widget(self._build_grid_header(headers, 'students'))
 
-            action_box.add_widget(disable_btn)
-            action_box.add_widget(assign_btn)
-            self.student_grid.add_widget(action_box)
-
-        scroll.add_widget(self.student_grid)
-        student_box.add_widget(scroll)
+        # Student rows - recycled, only the rows in the viewport get widgets
+        self.student_rv = RecordGrid(viewclass=StudentRow, dashboard=self, timing_name='Grid: students')
+        student_box.add_widget(self.student_rv)
+        student_box.add_widget(self._build_pager('students'))
+        self.show_students(self.students.rows())
 
         # Student controls
         control_box = BoxLayout(size_hint=(1, None), height=dp(50), spacing=dp(10))
@@ -684,65 +1786,53 @@ class AdminDashboard(Screen):
 
         control_box.add_widget(manual_add_btn)
         control_box.add_widget(bulk_import_btn)
+        self._add_export_buttons(control_box, 'students')
         student_box.add_widget(control_box)
 
         layout.add_widget(student_box)
         return layout
 
     def search_students(self, instance):
-        search_term = self.search_input.text.lower()
-        if not search_term:
-            self.refresh_student_list()
-            return
-
-        filtered_students = [
-            s for s in self.student_list
-            if (search_term in s['name'].lower() or
-                search_term in s.get('student_number', '').lower())
-        ]
-
-        self.student_grid.clear_widgets()
-        headers = ['ID', 'Student #', 'Name', 'Class', 'Fees Paid', 'Actions']
-        for header in headers:
-            label = Label(text=header, size_hint_y=None, height=dp(40), bold=True)
-            self.student_grid.add_widget(label)
-
-        for student in filtered_students:
-            # ID
-            id_label = Label(text=str(student['id']), size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(id_label)
-
-            # Student Number
-            num_label = Label(text=student.get('student_number', 'N/A'), size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(num_label)
-
-            # Name
-            name_label = Label(text=student['name'], size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(name_label)
+        self._run_search('students', self.search_input.text, self.show_students)
 
-            # Class
-            class_label = Label(text=student['class'], size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(class_label)
-
-            # Fees Paid
-            fees_label = Label(text=f"${student['fees_paid']}", size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(fees_label)
+    def clear_search(self, instance):
+        self.search_input.text = ''
+        self.search_students(instance)
+
+    def _run_search(self, channel, query, show):
+        # Every call supersedes the previous query on the same channel. The
+        # lookup runs on the search worker and its result is only applied -
+        # in one batch, on the UI thread - if nothing newer was asked since.
+        started = time.perf_counter()
+        operation = f"Search: {channel}"
+        generation = self._search_generations.get(channel, 0) + 1
+        self._search_generations[channel] = generation
+        pending = self._search_futures.pop(channel, None)
+        if pending is not None:
+            pending.cancel()
+
+        query = query.strip().lower()
+        if not query:
+            show(self.students.rows())
+            self.timings.record(operation, time.perf_counter() - started)
+            return
 
-            # Actions
-            action_box = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(5))
-            edit_btn = Button(text='Edit', size_hint_x=0.4)
-            assign_btn = Button(text='Assign Class', size_hint_x=0.6)
+        index = self.search_index
+        students = self.students
 
-            edit_btn.bind(on_press=lambda x, s=student: self.edit_student(s))
-            assign_btn.bind(on_press=lambda x, s=student: self.assign_student_class(s))
+        def evaluate():
+            if self._search_generations[channel] != generation:
+                return  # superseded before it got to run
+            matches = students.select(index.search(query))
+            Clock.schedule_once(lambda dt: apply(matches))
 
-            action_box.add_widget(edit_btn)
-            action_box.add_widget(assign_btn)
-            self.student_grid.add_widget(action_box)
+        def apply(matches):
+            if self._search_generations[channel] == generation:
+                show(matches)
+                # From the query to its results being in place
+                self.timings.record(operation, time.perf_counter() - started)
 
-    def clear_search(self, instance):
-        self.search_input.text = ''
-        self.refresh_student_list()
+        self._search_futures[channel] = self._search_executor.submit(evaluate)
 
     def show_add_student_popup(self, instance):
         content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
@@ -773,10 +1863,15 @@ class AdminDashboard(Screen):
     def show_bulk_import_popup(self, instance):
         content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
 
+        # Imported on first use rather than with the dashboard; most
+        # sessions never open the import dialog
+        from kivy.uix.filechooser import FileChooserListView
+
         # Create file chooser with filters
         self.file_chooser = FileChooserListView(
             filters=['*.csv'],  # Only show CSV files
-            path=os.path.expanduser('~')  # Start at user's home directory
+            path=os.path.expanduser('~'),  # Start at user's home directory
+            multiselect=True  # e.g. all per-class exports at term start
         )
 
         import_btn = Button(text='Import CSV', size_hint_y=None, height=dp(50))
@@ -795,101 +1890,444 @@ class AdminDashboard(Screen):
         self.popup.open()
 
     def add_student(self, instance):
+        existing = self.students.find('student_number', self.student_number.text)
+        if self.student_number.text and existing is not None:
+            self.report(f"Student number {self.student_number.text} already belongs to {existing['name']}",
+                        'students', 'WARNING')
+            return
         try:
             fees_paid = float(self.student_fees.text) if self.student_fees.text else 0
             new_student = {
-                'id': len(self.student_list) + 1,
                 'student_number': self.student_number.text,
                 'name': self.student_name.text,
                 'class': self.student_class.text,
                 'fees_paid': fees_paid,
-                'fees_due': 2000 - fees_paid
+                'fees_due': 2000 - fees_paid,
+                'last_payment': date.today().toordinal() if fees_paid else 0
             }
-            self.student_list.append(new_student)
-            self.refresh_student_list()
-            self.status_message = f"Added student: {new_student['name']} ({new_student['student_number']})"
+            self.database.add_students([new_student])
+            self._index_student(self.students.append(new_student), new_student)
+            self.class_rollups.add(new_student)
+            self.notify('summary', 'students', 'fees')
+            self.report(f"Added student: {new_student['name']} ({new_student['student_number']})", 'students')
             self.popup.dismiss()
         except ValueError:
-            self.status_message = "Invalid fees amount"
+            self.report("Invalid fees amount", 'students', 'WARNING')
 
     def import_students_csv(self, instance):
+        if self._import_job is not None:
+            self.report("An import is already running", 'import', 'WARNING')
+            return
         if not self.file_chooser.selection:
-            self.status_message = "No file selected"
+            self.report("No file selected", 'import', 'WARNING')
+            return
+
+        filepaths = list(self.file_chooser.selection)
+        if not all(filepath.lower().endswith('.csv') for filepath in filepaths):
+            self.report("Please select CSV files only", 'import', 'WARNING')
             return
 
         try:
-            filepath = self.file_chooser.selection[0]
-            if not filepath.lower().endswith('.csv'):
-                self.status_message = "Please select a CSV file"
-                return
+            # Several files, or one file too big for a single parser, are
+            # parsed in a process pool; otherwise stream it on one thread
+            if len(filepaths) > 1 or os.path.getsize(filepaths[0]) > 2 * SHARD_BYTES:
+                job = ParallelImportJob(filepaths, prepare=self._student_search_entry)
+            else:
+                job = ImportJob(filepaths, prepare=self._student_search_entry)
+        except OSError as e:
+            self.report(f"Import failed: {str(e)}", 'import', 'ERROR')
+            return
 
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    try:
-                        fees_paid = float(row.get('fees_paid', 0))
-                        self.student_list.append({
-                            'id': len(self.student_list) + 1,
-                            'student_number': row.get('student_number', ''),
-                            'name': row.get('name', ''),
-                            'class': row.get('class', ''),
-                            'fees_paid': fees_paid,
-                            'fees_due': 2000 - fees_paid
-                        })
-                    except ValueError:
-                        continue  # Skip rows with invalid data
-
-            self.refresh_student_list()
-            self.status_message = f"Imported {len(reader.fieldnames)} fields from CSV"
-            self.popup.dismiss()
-        except Exception as e:
-            self.status_message = f"Import failed: {str(e)}"
+        # Parse off the UI thread; the UI thread commits the parsed chunks.
+        # The commit callback stops its own interval when the job ends
+        self._import_job = job
+        self._show_import_progress(job)
+        threading.Thread(target=job.run, name='csv-import', daemon=True).start()
+        Clock.schedule_interval(lambda dt: self._commit_import_chunks(job), 0)
+
+    def _show_import_progress(self, job):
+        content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
+        source = os.path.basename(job.paths[0]) if len(job.paths) == 1 else f"{len(job.paths)} files"
+        content.add_widget(Label(text=source, size_hint_y=None, height=dp(30)))
+
+        self.import_progress = ProgressBar(max=100, size_hint_y=None, height=dp(30))
+        self.import_stats = Label(text='Starting import...', size_hint_y=None, height=dp(30))
+        cancel_btn = Button(text='Cancel', size_hint_y=None, height=dp(50))
+        cancel_btn.bind(on_press=lambda x: setattr(job, 'cancelled', True))
+
+        content.add_widget(self.import_progress)
+        content.add_widget(self.import_stats)
+        content.add_widget(cancel_btn)
+        # The chooser popup becomes the progress view; it stays up until the
+        # import ends so the dialog cannot be reopened behind it
+        self._import_popup = self.popup
+        self._import_popup.content = content
+        self._import_popup.title = 'Importing Students'
+        self._import_popup.auto_dismiss = False
+
+    def _commit_import_chunks(self, job):
+        # Commit parsed chunks until this frame's budget is spent, so the
+        # window keeps drawing while a large file streams in
+        started = time.perf_counter()
+        deadline = started + self.IMPORT_FRAME_BUDGET
+        with self.batch():
+            while not job.cancelled and time.perf_counter() < deadline:
+                try:
+                    students, rejected, bytes_read, search_entries = job.chunks.get_nowait()
+                except queue.Empty:
+                    break
+
+                # One transaction per chunk; the database assigns the ids
+                try:
+                    self.database.add_students(students)
+                except sqlite3.Error as e:
+                    job.error = str(e)
+                    job.cancelled = True
+                    break
+                first_position = len(self.students)
+                self.students.extend(students)
+                self.class_rollups.add_many(students)
+                self.search_index.add_many(zip(range(first_position, first_position + len(students)),
+                                               search_entries))
+                self.notify('summary')
+
+                job.imported += len(students)
+                job.rejected += rejected
+                job.bytes_read = bytes_read
+
+        self.import_progress.value = job.progress
+        self.import_stats.text = (f"{job.imported:,} imported, {job.rejected:,} rejected "
+                                  f"({job.rows_per_second:,.0f} rows/s)")
+
+        self.timings.record('Import frame', time.perf_counter() - started)
+        if job.cancelled or (job.done and job.chunks.empty()):
+            self._finish_import(job)
+            return False
+
+    def _finish_import(self, job):
+        self._import_job = None
+        self.timings.record('Import', time.perf_counter() - job.started)
+
+        # Rebuild the grids once for the whole import
+        self.notify('students', 'fees')
+
+        if job.error:
+            self.report(f"Import failed: {job.error} ({job.imported} students imported)", 'import', 'ERROR')
+        elif job.cancelled:
+            self.report(f"Import cancelled: {job.imported} students imported, {job.rejected} rows rejected",
+                        'import', 'WARNING')
+        else:
+            self.report(f"Imported {job.imported} students, {job.rejected} rows rejected", 'import')
+        self._import_popup.dismiss()
 
     def edit_student(self, student):
-        self.status_message = f"Editing student: {student['name']} ({student.get('student_number', '')})"
+        self.report(f"Editing student: {student['name']} ({student.get('student_number', '')})", 'students')
 
     def assign_student_class(self, student):
-        self.status_message = f"Assigning class for: {student['name']} ({student.get('student_number', '')})"
-
-    def refresh_student_list(self):
-        self.student_grid.clear_widgets()
-        headers = ['ID', 'Student #', 'Name', 'Class', 'Fees Paid', 'Actions']
-        for header in headers:
-            label = Label(text=header, size_hint_y=None, height=dp(40), bold=True)
-            self.student_grid.add_widget(label)
+        self.report(f"Assigning class for: {student['name']} ({student.get('student_number', '')})", 'students')
+        if self._assign_popup is None:
+            self._assign_popup = self._build_assign_popup()
+        # The popup is built once; each use points it at the new student
+        popup = self._assign_popup
+        popup.student = student
+        popup.title = f"Assign Class: {student['name']}"
+        popup.class_spinner.values = self.class_list
+        popup.class_spinner.text = student['class'] or 'Select Class'
+        popup.open()
 
-        for student in self.student_list:
-            # ID
-            id_label = Label(text=str(student['id']), size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(id_label)
+    def _build_assign_popup(self):
+        content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
 
-            # Student Number
-            num_label = Label(text=student.get('student_number', 'N/A'), size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(num_label)
+        class_spinner = Spinner(size_hint_y=None, height=dp(50))
+        content.add_widget(class_spinner)
 
-            # Name
-            name_label = Label(text=student['name'], size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(name_label)
+        btn_box = BoxLayout(size_hint=(1, None), height=dp(50), spacing=dp(10))
+        save_btn = Button(text='Assign',
+                          background_color=(0.2, 0.6, 1, 1),
+                          background_normal='',
+                          color=(1, 1, 1, 1))
+        cancel_btn = Button(text='Cancel')
+        btn_box.add_widget(save_btn)
+        btn_box.add_widget(cancel_btn)
+        content.add_widget(btn_box)
 
-            # Class
-            class_label = Label(text=student['class'], size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(class_label)
+        popup = Popup(content=content, size_hint=(0.6, 0.4))
+        popup.class_spinner = class_spinner
+        popup.student = None
 
-            # Fees Paid
-            fees_label = Label(text=f"${student['fees_paid']}", size_hint_y=None, height=dp(40))
-            self.student_grid.add_widget(fees_label)
+        def assign(instance):
+            self.move_student_to_class(popup.student, class_spinner.text)
+            popup.dismiss()
 
-            # Actions
-            action_box = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(5))
-            edit_btn = Button(text='Edit', size_hint_x=0.4)
-            assign_btn = Button(text='Assign Class', size_hint_x=0.6)
+        save_btn.bind(on_press=assign)
+        cancel_btn.bind(on_press=popup.dismiss)
+        popup.bind(on_dismiss=lambda instance: setattr(popup, 'student', None))
+        return popup
 
-            edit_btn.bind(on_press=lambda x, s=student: self.edit_student(s))
-            assign_btn.bind(on_press=lambda x, s=student: self.assign_student_class(s))
+    def move_student_to_class(self, student, class_name):
+        if class_name not in self.class_list or class_name == student['class']:
+            return
+        self.class_rollups.remove(student)
+        student['class'] = class_name
+        self.class_rollups.add(student)
+        self.database.update_student(student)
+
+        self.report(f"Assigned {student['name']} to {class_name}", 'students')
+        self.notify('summary', 'student_rows', 'fee_rows')
+
+    def toggle_student_status(self, student):
+        self.class_rollups.remove(student)
+        student['active'] = not student.get('active', True)
+        self.class_rollups.add(student)
+        self.database.update_student(student)
+        state = 'Enabled' if student['active'] else 'Disabled'
+        self.report(f"{state} student: {student['name']} ({student.get('student_number', '')})", 'students')
+        self.notify('summary', 'student_rows', 'fee_rows')
 
-            action_box.add_widget(edit_btn)
-            action_box.add_widget(assign_btn)
-            self.student_grid.add_widget(action_box)
+    def refresh_student_list(self):
+        self.notify('students')
+
+    def show_students(self, students):
+        # Lists the given rows from their first page. The page's records are
+        # the view's data; StudentRow formats the cells when (and if) the row
+        # scrolls into view
+        self._set_grid_rows('students', students)
+
+    def _grid(self, table):
+        return self.student_rv if table == 'students' else self.fee_rv
+
+    def _set_grid_rows(self, table, rows, keep_page=False):
+        # Lists the rows from the first page, or with keep_page from the page
+        # and scroll position the grid is on
+        state = self._grid_pages[table]
+        state['search'] = rows
+        state['search_bitmap'] = None if len(rows) == self.students.live_count else bitmap_of(rows.positions)
+        state['bitmap'] = self._grid_bitmap(state)
+        if keep_page:
+            self._show_page(table, state['anchor'], keep_scroll=True)
+        else:
+            self._show_page(table)
+
+    def _build_filter_bar(self, table):
+        filter_box = BoxLayout(size_hint=(1, None), height=dp(40), spacing=dp(10))
+        inputs = self._filter_inputs[table] = {
+            'class': Spinner(text='All classes', values=['All classes'], size_hint_x=0.2),
+            'fee_status': Spinner(text=self.FEE_FILTERS[0], values=self.FEE_FILTERS, size_hint_x=0.15),
+            'active': Spinner(text='All students', values=list(self.STATUS_FILTERS), size_hint_x=0.15),
+            'balance': TextInput(hint_text='Balance over (KES)', input_filter='float', multiline=False,
+                                 size_hint_x=0.35)
+        }
+        # Choices apply on the next frame, so a reset filters once; a typed
+        # balance waits for typing to pause, like the search box
+        filter_trigger = Clock.create_trigger(lambda dt: self.filter_grid(table))
+        balance_trigger = Clock.create_trigger(lambda dt: self.filter_grid(table), self.SEARCH_DEBOUNCE)
+        for name in ('class', 'fee_status', 'active'):
+            inputs[name].bind(text=lambda instance, text: filter_trigger())
+        inputs['balance'].bind(text=lambda instance, text: balance_trigger())
+
+        # Red reset button
+        reset_btn = Button(text='Reset Filters',
+                           size_hint_x=0.15,
+                           background_color=(1, 0.4, 0.4, 1),
+                           background_normal='',
+                           color=(1, 1, 1, 1))
+        reset_btn.bind(on_press=lambda x: self.reset_filters(table))
+
+        for widget in inputs.values():
+            filter_box.add_widget(widget)
+        filter_box.add_widget(reset_btn)
+        self._update_class_filters()
+        return filter_box
+
+    def _update_class_filters(self):
+        # Classes come from the rollups, so imported classes are offered too
+        classes = ['All classes'] + sorted(self.class_rollups.classes)
+        for inputs in self._filter_inputs.values():
+            if inputs['class'].values != classes:  # Setting them rebuilds the dropdown
+                inputs['class'].values = classes
+
+    def reset_filters(self, table):
+        inputs = self._filter_inputs[table]
+        inputs['class'].text = 'All classes'
+        inputs['fee_status'].text = self.FEE_FILTERS[0]
+        inputs['active'].text = 'All students'
+        inputs['balance'].text = ''
+
+    def filter_grid(self, table):
+        # Reads the filter bar into the grid's filters and lists the rows of
+        # its current search that pass them all
+        inputs = self._filter_inputs[table]
+        state = self._grid_pages[table]
+        try:
+            balance = float(inputs['balance'].text) if inputs['balance'].text.strip() else None
+        except ValueError:
+            balance = None  # Half-typed, e.g. a lone '.'
+        state['filters'] = {
+            'class': () if inputs['class'].text == 'All classes' else (inputs['class'].text,),
+            'fee_status': () if inputs['fee_status'].text == self.FEE_FILTERS[0] else (inputs['fee_status'].text,),
+            'active': self.STATUS_FILTERS[inputs['active'].text],
+            'balance': balance
+        }
+        if state['search'] is None:
+            return
+        with self.timings.time(f"Filter: {table}"):
+            self._set_grid_rows(table, state['search'])
+        self.report(f"{len(self._grid_order(table)[0]):,} of {len(state['search']):,} records match the filters",
+                    table)
+
+    def _filter_bitmap(self, filters):
+        # Rows passing every filter, as a bitmap: each filter ORs the bitmaps
+        # of the values it accepts and the filters are ANDed. None when no
+        # filter is set.
+        store = self.students
+        bitmaps = []
+        if filters['class']:
+            bitmaps.append(store.bitmap_by('class').get(*filters['class']))
+        if filters['fee_status']:
+            bitmaps.append(store.bitmap_by('fees_due', fee_status).get(*filters['fee_status']))
+        if filters['active']:
+            bitmaps.append(store.bitmap_by('active').get(*filters['active']))
+        if filters['balance'] is not None:
+            bitmaps.append(self._balance_over(filters['balance']))
+        return reduce(operator.and_, bitmaps) if bitmaps else None
+
+    def _balance_over(self, threshold):
+        # Balances over the threshold are the tail of the sorted fees_due
+        # index, found by binary search. Kept until the threshold or the
+        # balances change.
+        index = self.students.sorted_by('fees_due')
+        cached = self._balance_bitmap
+        if cached is None or cached[:2] != (threshold, index) or cached[2] != index.version:
+            positions = index.positions
+            tail = positions[bisect_right(positions, (threshold, float('inf')), index.key):]
+            cached = self._balance_bitmap = (threshold, index, index.version, bitmap_of(tail))
+        return cached[3]
+
+    def _grid_bitmap(self, state):
+        # The rows of the grid's search that pass its filters; None if that
+        # is every student
+        bitmap = self._filter_bitmap(state['filters'])
+        search = state['search_bitmap']
+        if search is None:
+            return bitmap
+        return search if bitmap is None else bitmap & search
+
+    def sort_grid(self, table, column):
+        # A second click on the same header reverses the order
+        state = self._grid_pages[table]
+        state['descending'] = state['sort'] == column and not state['descending']
+        state['sort'] = column
+        with self.timings.time(f"Sort: {table}"):
+            self._show_page(table)
+        for text, sort_btn in state['headers'].items():
+            sorted_here = SORT_COLUMNS[table][text] == column
+            sort_btn.text = text + ((' (desc)' if state['descending'] else ' (asc)') if sorted_here else '')
+
+    def _grid_order(self, table):
+        # The grid's rows ascending by the sort column, and the key they are
+        # ordered by. Listing every student reads the store's SortedIndex as
+        # is; for a search or filter result the index is narrowed to its
+        # rows, once, and kept until the rows, the sort or the index change.
+        state = self._grid_pages[table]
+        if state['search'].store is not self.students:
+            # Rows of a store replaced by a refresh
+            state['search'], state['search_bitmap'] = self.students.rows(), None
+            state['bitmap'] = self._grid_bitmap(state)
+        bitmap, column = state['bitmap'], state['sort']
+        if column is None:
+            index = None
+            key = int  # Positions are in the order rows were added
+        else:
+            index = self.students.sorted_by(column, SORT_TRANSFORMS.get(column))
+            key = index.key
+        if bitmap is None:
+            return (state['search'].positions if index is None else index.positions), key
+
+        # Compared by value: an edit that leaves the rows as they were keeps the order
+        version = (self.students, column, index and index.version, bitmap)
+        if state['ordered'] is None or state['ordered'][0] != version:
+            flags = bitmap_flags(bitmap, len(self.students))
+            ordered = range(len(self.students)) if index is None else index.positions
+            state['ordered'] = version, restrict(ordered, flags)
+        return state['ordered'][1], key
+
+    def _page_bounds(self, table, ordered, key, anchor=None, last=False):
+        # Slice of `ordered` on the page that starts at the row keyed
+        # `anchor` (or the first/last page), found by binary search
+        state = self._grid_pages[table]
+        size, count = self.PAGE_ROWS, len(ordered)
+        if not state['descending']:
+            if last:
+                start = max(0, count - size)
+            else:
+                start = 0 if anchor is None else bisect_left(ordered, anchor, key)
+                if start >= count:
+                    start = max(0, count - size)  # The anchor row and all after it are gone
+            return start, min(count, start + size)
+        # Descending pages read the ascending order backwards
+        if last:
+            end = min(count, size)
+        else:
+            end = count if anchor is None else bisect_right(ordered, anchor, key)
+            if end <= 0:
+                end = min(count, size)
+        return max(0, end - size), end
+
+    def _show_page(self, table, anchor=None, last=False, keep_scroll=False):
+        grid = self._grid(table)
+        state = self._grid_pages[table]
+        if grid is None or state['search'] is None:
+            return
+        ordered, key = self._grid_order(table)
+        start, end = self._page_bounds(table, ordered, key, anchor, last)
+        page = ordered[start:end]
+        if state['descending']:
+            page = page[::-1]
+            first = len(ordered) - end
+        else:
+            first = start
+        state['anchor'] = key(page[0]) if len(page) else None
+        grid.data = RecordSelection(self.students, page)
+        if not keep_scroll:
+            grid.scroll_y = 1
+        state['pager_label'].text = (f"Rows {first + 1:,}-{first + len(page):,} of {len(ordered):,}"
+                                     if len(page) else "No records")
+
+    def turn_page(self, table, step):
+        state = self._grid_pages[table]
+        if self._grid(table) is None or state['search'] is None:
+            return
+        if step in ('first', 'last'):
+            self._show_page(table, last=step == 'last')
+            return
+        ordered, key = self._grid_order(table)
+        start, end = self._page_bounds(table, ordered, key, state['anchor'])
+        size, descending = self.PAGE_ROWS, state['descending']
+        # Next moves up the ascending order, unless the grid shows it reversed.
+        # The new anchor is the row the new page shows first.
+        if (step == 'next') != descending:
+            if end >= len(ordered):
+                return
+            first = min(len(ordered), end + size) - 1 if descending else end
+        else:
+            if start <= 0:
+                return
+            first = start - 1 if descending else max(0, start - size)
+        self._show_page(table, key(ordered[first]))
+
+    def _refresh_page(self, table):
+        # Same page, re-read after edits: rows that moved under the sort move
+        # with it, and rows an edit took out of the filters drop out
+        state = self._grid_pages[table]
+        if state['search'] is not None and state['search'].store is self.students:
+            state['bitmap'] = self._grid_bitmap(state)
+        self._show_page(table, state['anchor'], keep_scroll=True)
+
+    def _grid_positions(self, table):
+        # Every row the grid lists, in the order shown, copied so later edits
+        # cannot shift it
+        ordered = self._grid_order(table)[0]
+        return array('q', reversed(ordered) if self._grid_pages[table]['descending'] else ordered)
 
     def _create_financial_management_tab(self):
         layout = BoxLayout(orientation='vertical', spacing=dp(15), padding=dp(20))
@@ -897,6 +2335,8 @@ class AdminDashboard(Screen):
         # Search bar
         search_box = BoxLayout(size_hint=(1, None), height=dp(50), spacing=dp(10))
         self.fee_search_input = TextInput(hint_text='Search by student name or ID', size_hint_x=0.7)
+        self._fee_search_trigger = Clock.create_trigger(self.search_fee_records, self.SEARCH_DEBOUNCE)
+        self.fee_search_input.bind(text=lambda instance, text: self._fee_search_trigger())
 
         # Blue search button
         search_btn = Button(text='Search',
@@ -918,53 +2358,25 @@ class AdminDashboard(Screen):
         search_box.add_widget(search_btn)
         search_box.add_widget(clear_btn)
         layout.add_widget(search_box)
+        layout.add_widget(self._build_filter_bar('fees'))
 
         # Fee records
         fee_box = BoxLayout(orientation='vertical', spacing=dp(10))
         fee_box.add_widget(Label(text='Fee Records', size_hint=(1, None), height=dp(30)))
 
-        scroll = ScrollView()
-        self.fee_grid = GridLayout(cols=5, size_hint_y=None, spacing=dp(5))  # Added column for ID
-        self.fee_grid.bind(minimum_height=self.fee_grid.setter('height'))
-
         # Header row
         headers = ['ID', 'Student', 'Class', 'Amount', 'Status']
-        for header in headers:
-            self.fee_grid.add_widget(Label(text=header, size_hint_y=None, height=dp(40), bold=True))
-
-        # Fee rows
-        for student in self.student_list:
-            status = 'Paid' if student['fees_due'] <= 0 else 'Pending'
-            status_color = (0.2, 0.7, 0.3, 1) if status == 'Paid' else (1, 0.4, 0.4, 1)  # Green/Red
-
-            # Student ID
-            self.fee_grid.add_widget(Label(text=student.get('student_id', 'N/A'),
-                                           size_hint_y=None, height=dp(40)))
-
-            # Student Name
-            self.fee_grid.add_widget(Label(text=student['name'],
-                                           size_hint_y=None, height=dp(40)))
-
-            # Class
-            self.fee_grid.add_widget(Label(text=student['class'],
-                                           size_hint_y=None, height=dp(40)))
-
-            # Amount (changed to KES)
-            amount_text = f"KES {student['fees_paid']:,}/{student['fees_paid'] + student['fees_due']:,}"
-            self.fee_grid.add_widget(Label(text=amount_text,
-                                           size_hint_y=None, height=dp(40)))
-
-            # Status with colored background
-            status_btn = Button(text=status,
-                                size_hint_y=None, height=dp(40),
-                                background_color=status_color,
-                                background_normal='',
-                                color=(1, 1, 1, 1))  # White text
-            status_btn.bind(on_press=lambda x, s=student: self.view_fee_details(s))
-            self.fee_grid.add_widget(status_btn)
+        fee_box.add_widget(self._build_grid_header(headers, 'fees'))
+
+        # Fee rows - recycled, amounts are formatted only once a row is visible
+        self.fee_rv = RecordGrid(viewclass=FeeRow, dashboard=self, timing_name='Grid: fees')
+        fee_box.add_widget(self.fee_rv)
+        fee_box.add_widget(self._build_pager('fees'))
+        self.show_fee_records(self.students.rows())
 
-        scroll.add_widget(self.fee_grid)
-        fee_box.add_widget(scroll)
+        export_box = BoxLayout(size_hint=(1, None), height=dp(50), spacing=dp(10))
+        self._add_export_buttons(export_box, 'fees')
+        fee_box.add_widget(export_box)
         layout.add_widget(fee_box)
 
         # Reports section
@@ -1004,26 +2416,153 @@ class AdminDashboard(Screen):
 
         return layout
 
+    def _add_export_buttons(self, box, table):
+        for file_format in ('CSV', 'XLSX'):
+            # Gray export buttons
+            export_btn = Button(text=f'Export {file_format}',
+                                size_hint_x=0.2,
+                                background_color=(0.5, 0.5, 0.5, 1),
+                                background_normal='',
+                                color=(1, 1, 1, 1))
+            export_btn.bind(on_press=lambda x, f=file_format: self.export_records(table, f))
+            box.add_widget(export_btn)
+
+    def export_records(self, table, file_format):
+        # Exports every row the grid lists - all pages, in the shown order,
+        # with the search filter applied - on a worker thread, streaming
+        # them straight to the file
+        if self._export_job is not None:
+            self.report("An export is already running", 'export', 'WARNING')
+            return
+        if self._grid_pages[table]['search'] is None:
+            return
+        columns = STUDENT_EXPORT_COLUMNS if table == 'students' else FEE_EXPORT_COLUMNS
+        path = os.path.join(os.path.expanduser('~'),
+                            f"{table}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_format.lower()}")
+        job = ExportJob(path, RecordSelection(self.students, self._grid_positions(table)), columns)
+        self._export_job = job
+        self._show_export_progress(job)
+        threading.Thread(target=job.run, name='export', daemon=True).start()
+        self._export_event = Clock.schedule_interval(lambda dt: self._poll_export(job), 0.1)
+
+    def _show_export_progress(self, job):
+        content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
+        content.add_widget(Label(text=os.path.basename(job.path), size_hint_y=None, height=dp(30)))
+
+        self.export_progress = ProgressBar(max=100, size_hint_y=None, height=dp(30))
+        self.export_stats = Label(text='Starting export...', size_hint_y=None, height=dp(30))
+        cancel_btn = Button(text='Cancel', size_hint_y=None, height=dp(50))
+        cancel_btn.bind(on_press=lambda x: setattr(job, 'cancelled', True))
+
+        content.add_widget(self.export_progress)
+        content.add_widget(self.export_stats)
+        content.add_widget(cancel_btn)
+        self._export_popup = Popup(title='Exporting Records', content=content, size_hint=(0.6, 0.5),
+                                   auto_dismiss=False)
+        self._export_popup.open()
+
+    def _poll_export(self, job):
+        self.export_progress.value = job.progress
+        self.export_stats.text = f"{job.written:,} of {job.total:,} rows written"
+        if not job.done:
+            return
+
+        self._export_event.cancel()
+        self._export_job = None
+        self._export_popup.dismiss()
+        elapsed = time.perf_counter() - job.started
+        if job.error:
+            self.report(f"Export failed: {job.error}", 'export', 'ERROR')
+        elif job.cancelled:
+            self.report("Export cancelled", 'export', 'WARNING')
+        else:
+            self.timings.record('Export', elapsed)
+            self.report(f"Exported {job.written:,} rows to {job.path} in {elapsed:.1f} s", 'export')
+        return False
+
     def search_fee_records(self, instance):
-        query = self.fee_search_input.text.lower()
-        # Filter self.student_list based on query
-        # Then refresh the fee_grid display
+        self._run_search('fees', self.fee_search_input.text, self.show_fee_records)
 
     def clear_fee_search(self, instance):
         self.fee_search_input.text = ''
-        # Reset to show all records
-        # Refresh the fee_grid display
+        self.search_fee_records(instance)
+
+    def refresh_fee_list(self):
+        self.notify('fees')
+
+    def show_fee_records(self, students):
+        self._set_grid_rows('fees', students)
 
     def view_fee_details(self, student):
         # Show detailed fee information for the student
         pass
 
     def generate_report(self, report_type):
-        # Generate the requested financial report
-        pass
-
-    def generate_report(self, report_type):
-        self.status_message = f"Generating {report_type} report..."
+        started = time.perf_counter()
+        columns = self.students.columns
+        summary = summarise_fees(columns['class'].codes, columns['class'].labels,
+                                 columns['fees_paid'].values, columns['fees_due'].values,
+                                 columns['last_payment'].values, self.students.live,
+                                 date.today().toordinal())
+        elapsed = time.perf_counter() - started
+
+        title = report_type if report_type.endswith('Report') else f"{report_type} Report"
+        self.timings.record(f"Report: {title}", elapsed)
+        self._show_report_popup(title, self._format_fee_report(report_type, title, summary))
+        self.report(f"Generated {title} in {elapsed * 1000:.1f} ms", 'reports')
+
+    def _format_fee_report(self, report_type, title, summary):
+        school = summary['school']
+        lines = [f"=== {title} ===",
+                 f"Date: {datetime.now().strftime('%Y-%m-%d')}",
+                 f"Generated by: {getattr(self.current_user, 'full_name', 'Admin')}",
+                 ""]
+
+        def aging(totals):
+            return " | ".join(f"{bucket}: KES {amount:,.0f}" for bucket, amount in zip(AGING_BUCKETS, totals['aging']))
+
+        if report_type == 'Annual Report':
+            lines += ["School-wide:",
+                      f"- Students: {school['students']:,}",
+                      f"- Billed: KES {school['billed']:,.0f}",
+                      f"- Collected: KES {school['collected']:,.0f} ({school['collection_rate']:.1f}%)",
+                      f"- Outstanding: KES {school['outstanding']:,.0f} from {school['owing']:,} students",
+                      f"- Aging: {aging(school)}",
+                      ""]
+
+        if report_type == 'Outstanding Fees':
+            lines.append("Outstanding by class:")
+            for totals in summary['classes']:
+                lines.append(f"- {totals['class']}: KES {totals['outstanding']:,.0f} "
+                             f"from {totals['owing']:,} of {totals['students']:,} students")
+                lines.append(f"    {aging(totals)}")
+            lines += ["", f"Total outstanding: KES {school['outstanding']:,.0f}", f"Aging: {aging(school)}"]
+        else:
+            lines.append("Collection by class:")
+            for totals in summary['classes']:
+                lines.append(f"- {totals['class']}: KES {totals['collected']:,.0f} of "
+                             f"{totals['billed']:,.0f} ({totals['collection_rate']:.1f}%)")
+            lines += ["", f"Total collected: KES {school['collected']:,.0f} of {school['billed']:,.0f} "
+                          f"({school['collection_rate']:.1f}%)"]
+        return "\n".join(lines)
+
+    def _update_summary(self, *args):
+        if self.summary_label is None:
+            return
+        school = self.class_rollups.school()
+        self.summary_label.text = (f"{school['students']:,} students ({school['active']:,} active) | "
+                                   f"KES {school['collected']:,.0f} collected | "
+                                   f"KES {school['outstanding']:,.0f} outstanding")
+
+    def _show_report_popup(self, title, text):
+        content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(10))
+        content.add_widget(TextInput(text=text, readonly=True, font_name='RobotoMono-Regular'))
+        close_btn = Button(text='Close', size_hint_y=None, height=dp(50))
+        content.add_widget(close_btn)
+
+        popup = Popup(title=title, content=content, size_hint=(0.8, 0.8))
+        close_btn.bind(on_press=popup.dismiss)
+        popup.open()
 
     # 5. Reports Functions
     def _create_reports_tab(self):
@@ -1043,49 +2582,226 @@ class AdminDashboard(Screen):
         layout.add_widget(academic_box)
 
         # System logs
-        log_box = BoxLayout(orientation='vertical', spacing=dp(10))
+        log_box = BoxLayout(orientation='vertical', spacing=dp(10), size_hint=(1, 2))
         log_box.add_widget(Label(text='System Logs', size_hint=(1, None), height=dp(30)))
 
-        self.log_display = TextInput(readonly=True, size_hint=(1, 0.6))
-        refresh_btn = Button(text='Refresh Logs', size_hint=(1, None), height=dp(40))
-        refresh_btn.bind(on_press=self.refresh_logs)
-
-        log_box.add_widget(self.log_display)
-        log_box.add_widget(refresh_btn)
+        # Filters: minimum level and text, re-applied as the text is typed
+        filter_box = BoxLayout(size_hint=(1, None), height=dp(40), spacing=dp(10))
+        self.log_level_spinner = Spinner(text='All levels', values=list(self.LOG_LEVELS), size_hint_x=0.3)
+        self.log_level_spinner.bind(text=lambda instance, text: self.refresh_logs(instance))
+        self.log_filter_input = TextInput(hint_text='Filter logs', multiline=False, size_hint_x=0.7)
+        self._log_filter_trigger = Clock.create_trigger(self.refresh_logs, self.SEARCH_DEBOUNCE)
+        self.log_filter_input.bind(text=lambda instance, text: self._log_filter_trigger())
+        filter_box.add_widget(self.log_level_spinner)
+        filter_box.add_widget(self.log_filter_input)
+
+        # Only the visible events have widgets; starts scrolled to the newest
+        self.log_rv = RecordGrid(viewclass=LogRow, row_height=dp(30), dashboard=self, scroll_y=0)
+        self.refresh_logs(None)
+
+        log_btns = BoxLayout(size_hint=(1, None), height=dp(40), spacing=dp(10))
+        timings_btn = Button(text='Show Timings')
+        timings_btn.bind(on_press=self.show_timings)
+        export_btn = Button(text='Export Timings')
+        export_btn.bind(on_press=self.export_timings)
+        log_btns.add_widget(timings_btn)
+        log_btns.add_widget(export_btn)
+
+        log_box.add_widget(filter_box)
+        log_box.add_widget(self.log_rv)
+        log_box.add_widget(log_btns)
         layout.add_widget(log_box)
 
         return layout
 
     def view_academic_report(self, report_type):
-        self.status_message = f"Viewing {report_type} report"
-        # Sample log entries
-        self.log_display.text = f"""=== {report_type} Report ===
-Date: {datetime.now().strftime('%Y-%m-%d')}
-Generated by: {getattr(self.current_user, 'full_name', 'Admin')}
-
-Summary:
-- Grade 10A: 85% pass rate
-- Grade 9B: 78% pass rate
-- Math: 92% average
-- Science: 88% average"""
+        started = time.perf_counter()
+        self.report(f"Viewing {report_type} report", 'reports')
+        lines = [f"=== {report_type} Report ===",
+                 f"Date: {datetime.now().strftime('%Y-%m-%d')}",
+                 f"Generated by: {getattr(self.current_user, 'full_name', 'Admin')}",
+                 "",
+                 "Summary:"]
+
+        if report_type == 'Subject Analysis':
+            lines += [f"- {subject}: no marks recorded yet" for subject in self.subject_list]
+        elif report_type == 'Teacher Evaluation':
+            lines += [f"- {teacher['name']} ({teacher['role']}): {teacher['status']}" for teacher in self.teachers]
+        else:
+            # Read straight from the class rollups; no student is visited
+            for class_name, totals in sorted(self.class_rollups.classes.items()):
+                if totals['students']:
+                    lines.append(f"- {class_name}: {totals['students']:,} students, {totals['active']:,} active, "
+                                 f"KES {totals['collected']:,.0f} collected, "
+                                 f"KES {totals['outstanding']:,.0f} outstanding")
+        self.timings.record(f"Report: {report_type}", time.perf_counter() - started)
+        self._show_report_popup(f"{report_type} Report", "\n".join(lines))
+
+    def report(self, message, source='dashboard', level='INFO'):
+        # Shows the message in the status bar and records it in the system
+        # log. Appending is O(1): a filtered view only gains the new event.
+        self.status_message = message
+        event = self.event_log.add(level, source, message)
+        if self._log_matches is not None and event_matches(event, self._log_level, self._log_text):
+            self._log_matches.append(event)
+        self.notify('log')
 
     def refresh_logs(self, instance):
-        self.status_message = "Refreshed system logs"
-        self.log_display.text = "System logs refreshed at: " + datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Re-applies the level and text filters to the whole log
+        self._log_level = self.LOG_LEVELS[self.log_level_spinner.text]
+        self._log_text = self.log_filter_input.text.strip().lower()
+        if self._log_level != 'INFO' or self._log_text:
+            self._log_matches = self.event_log.matching(self._log_level, self._log_text)
+        else:
+            self._log_matches = None  # The view reads the ring buffer itself
+        self.notify('log')
+
+    def _show_log(self):
+        if self.log_rv is None:
+            return
+        if self._log_matches is None:
+            self.log_rv.data = self.event_log
+            return
+        # Drop matches the ring buffer has since overwritten
+        first_sequence = self.event_log.first_sequence
+        stale = 0
+        while stale < len(self._log_matches) and self._log_matches[stale].sequence < first_sequence:
+            stale += 1
+        del self._log_matches[:stale]
+        self.log_rv.data = self._log_matches
+
+    def show_timings(self, instance):
+        self._show_report_popup('Operation Timings', "Timings since start:\n\n" + self.timings.format_table())
+
+    def export_timings(self, instance):
+        # Written next to the database, where the office already backs up
+        path = os.path.join(os.path.dirname(os.path.abspath(self.database.path)),
+                            f"timings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        try:
+            self.timings.export_csv(path)
+        except OSError as e:
+            self.report(f"Export failed: {str(e)}", 'reports', 'ERROR')
+            return
+        self.report(f"Timings exported to {path}", 'reports')
 
     # Common Functions
     def refresh_data(self, instance):
-        self.status_message = "Refreshing all data..."
-        Clock.schedule_once(self._finish_refresh, 1)
+        if self._refreshing:
+            return
+        if self._import_running():
+            self.report("Refresh is unavailable while an import is running", 'data', 'WARNING')
+            return
+        self._refreshing = True
+        self.report("Refreshing all data...", 'data')
+        threading.Thread(target=self._refresh_worker, args=(time.perf_counter(),),
+                         name='refresh', daemon=True).start()
+
+    def _refresh_worker(self, started):
+        # Loads the new model off the UI thread; the UI thread only swaps it in
+        try:
+            snapshot = self.load_snapshot(self.database)
+        except Exception as e:
+            error = str(e)
+            Clock.schedule_once(lambda dt: self._refresh_failed(error))
+        else:
+            Clock.schedule_once(lambda dt: self._finish_refresh(snapshot, started))
+
+    def _finish_refresh(self, snapshot, started):
+        if snapshot['writes'] != self.database.writes:
+            # Something was saved while loading; load again so it is not lost
+            threading.Thread(target=self._refresh_worker, args=(started,), name='refresh', daemon=True).start()
+            return
 
-    def _finish_refresh(self, dt):
-        self.load_sample_data()
-        self.status_message = "All data refreshed successfully"
+        # One swap on the UI thread, so no frame ever sees half a model
+        previous = self.students
+        self._apply_snapshot(snapshot)
+        self._refreshing = False
+
+        # Re-render what is on screen: the teacher rows are diffed, and the
+        # grids keep their search, filters, sort and page, redrawing only
+        # the visible rows
+        self.notify('teachers')
+        if self.student_rv is not None:
+            self._carry_anchor('students', previous)
+            self._run_search('students', self.search_input.text,
+                             lambda rows: self._set_grid_rows('students', rows, keep_page=True))
+        if self.fee_rv is not None:
+            self._carry_anchor('fees', previous)
+            self._run_search('fees', self.fee_search_input.text,
+                             lambda rows: self._set_grid_rows('fees', rows, keep_page=True))
+
+        elapsed = time.perf_counter() - started
+        self.timings.record('Data refresh', elapsed)
+        self.report(f"All data refreshed in {elapsed * 1000:.0f} ms", 'data')
         Clock.schedule_once(lambda dt: setattr(self, 'status_message', ""), 2)
 
+    def _carry_anchor(self, table, previous):
+        # The page anchor is keyed by a row of the replaced store; key it by
+        # the same student's row in the new one. A student that is gone
+        # leaves the old key, which still falls between the same neighbours.
+        state = self._grid_pages[table]
+        anchor, column = state['anchor'], state['sort']
+        if anchor is None:
+            return
+        student = self.students.find('id', previous[anchor if column is None else anchor[1]]['id'])
+        if student is None:
+            return
+        key = int if column is None else self.students.sorted_by(column, SORT_TRANSFORMS.get(column)).key
+        state['anchor'] = key(student.position)
+
+    def _refresh_failed(self, error):
+        self._refreshing = False
+        self.report(f"Refresh failed: {error}", 'data', 'ERROR')
+
+    @contextmanager
+    def batch(self):
+        # Changes announced inside the block are held back and flushed once,
+        # on the next frame after the outermost batch ends
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._pending_changes:
+                self._flush_trigger()
+
+    def notify(self, *changes):
+        # Announces that parts of the UI are out of date: 'status',
+        # 'summary', 'teachers', 'students'/'fees' (grid contents) or
+        # 'student_rows'/'fee_rows' (only the visible rows' values)
+        self._pending_changes.update(changes)
+        if not self._batch_depth:
+            self._flush_trigger()
+
+    def _flush_changes(self, dt):
+        if self._batch_depth:
+            return  # The batch flushes when it ends
+        changes, self._pending_changes = self._pending_changes, set()
+
+        if 'status' in changes and self.status_bar is not None:
+            self.status_bar.text = self.status_message
+        if 'summary' in changes:
+            self._update_summary()
+            self._update_class_filters()
+        if 'teachers' in changes:
+            self.refresh_teacher_list()
+        if 'students' in changes:
+            self.show_students(self.students.rows())
+        elif 'student_rows' in changes:
+            self._refresh_page('students')
+        if 'fees' in changes:
+            self.show_fee_records(self.students.rows())
+        elif 'fee_rows' in changes:
+            self._refresh_page('fees')
+        if 'log' in changes:
+            self._show_log()
+
+    def _import_running(self):
+        return self._import_job is not None
+
     def show_reports(self, instance):
-        self.tabs.switch_to(self.tabs.tab_list[-1])  # Switch to Reports tab
-        self.status_message = "Showing reports dashboard"
+        self.tabs.switch_to(self.tab_items['Reports'])
+        self.report("Showing reports dashboard", 'reports')
 
     def logout(self, instance):
         self.manager.current = 'login'
@@ -1093,6 +2809,11 @@ Summary:
 
 class AdminApp(App):
     def build(self):
+        # Here rather than at import: LoginApp imports this module while its
+        # own window and logging are still in use
+        Logger.setLevel('ERROR')  # Only show errors and above
+        Window.size = (1200, 800)
+
         sm = ScreenManager()
         admin_dash = AdminDashboard(name='admin_dashboard')
 
@@ -1106,6 +2827,10 @@ class AdminApp(App):
         sm.add_widget(admin_dash)
         return sm
 
+    def on_stop(self):
+        # Lets the log writer finish the events still queued for the file
+        self.root.get_screen('admin_dashboard').event_log.close()
+
 
 if __name__ == '__main__':
     AdminApp().run()
\ No newline at end of file
@@ -0,0 +1,130 @@
+# Password checks for the login screen.
+# Passwords are stored as salted scrypt hashes (PBKDF2 where the Python
+# build lacks scrypt). Both are slow on purpose, so every check runs on a
+# worker thread and the caller gets a Future. Two things keep a busy
+# morning of logins on shared terminals cheap:
+# - a verified-session cache, so checking the same password again within
+#   SESSION_TTL skips the slow hash; logging out drops the session;
+# - a per-user throttle, so repeated wrong passwords are refused outright
+#   without spending a hash on them.
+
+import functools
+import hashlib
+import hmac
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SCRYPT_PARAMS = {'n': 2 ** 14, 'r': 8, 'p': 1}  # ~16 MiB and ~70 ms per check
+PBKDF2_ITERATIONS = 600000
+SESSION_TTL = 15 * 60  # seconds a verified login is remembered
+FREE_ATTEMPTS = 3  # failures before the throttle starts
+MAX_LOCKOUT = 300  # seconds; the lockout doubles per failure up to this
+MIN_PASSWORD_LENGTH = 8  # for accounts made here
+LOGIN_FAILED = "Invalid username, password or role"
+
+
+def hash_password(password, salt=None):
+    # Returns the encoded hash to store: "scrypt$n$r$p$salt$hash" or
+    # "pbkdf2_sha256$iterations$salt$hash", salt and hash in hex
+    salt = salt or os.urandom(16)
+    if hasattr(hashlib, 'scrypt'):
+        params = SCRYPT_PARAMS
+        digest = hashlib.scrypt(password.encode('utf-8'), salt=salt, dklen=32, **params)
+        return f"scrypt${params['n']}${params['r']}${params['p']}${salt.hex()}${digest.hex()}"
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password, encoded):
+    try:
+        algorithm, *fields = encoded.split('$')
+        if algorithm == 'scrypt':
+            n, r, p, salt, expected = fields
+            digest = hashlib.scrypt(password.encode('utf-8'), salt=bytes.fromhex(salt), n=int(n), r=int(r),
+                                    p=int(p), dklen=len(expected) // 2, maxmem=256 * 1024 * 1024)
+        elif algorithm == 'pbkdf2_sha256':
+            iterations, salt, expected = fields
+            digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), bytes.fromhex(salt), int(iterations))
+        else:
+            return False
+    except (ValueError, AttributeError):
+        return False  # Malformed hash, or scrypt missing from this build
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+@functools.lru_cache(maxsize=1)
+def _dummy_hash():
+    # Checked against when the username does not exist, so an unknown user
+    # takes as long to refuse as a wrong password. Made on first need, not
+    # at import, to keep it off the start-up path.
+    return hash_password('')
+
+
+class Authenticator:
+    def __init__(self, database, workers=2):
+        self.database = database
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='auth')
+        self._lock = threading.Lock()
+        # A key that lives only in this process; the cache keeps an HMAC of
+        # the password under it, never the password itself
+        self._session_key = os.urandom(32)
+        self._sessions = {}  # username -> (password tag, expiry, user)
+        self._failures = {}  # username -> (failure count, locked until)
+
+    def authenticate(self, username, password, role):
+        # Returns a Future of (user or None, message). The Future completes
+        # on a worker thread; UI callers hand the result back to their own.
+        return self._executor.submit(self._authenticate, username.strip().lower(), password, role)
+
+    def _authenticate(self, username, password, role):
+        now = time.monotonic()
+        tag = hmac.new(self._session_key, f"{username}\0{password}".encode('utf-8'), 'sha256').digest()
+        with self._lock:
+            locked_until = self._failures.get(username, (0, 0.0))[1]
+            if now < locked_until:
+                return None, f"Too many failed attempts; try again in {math.ceil(locked_until - now)} s"
+            session = self._sessions.get(username)
+        if session is not None and session[1] > now and hmac.compare_digest(session[0], tag):
+            user = session[2]
+        else:
+            user = self.database.load_user(username)
+            if not verify_password(password, user['password_hash'] if user else _dummy_hash()) or user is None:
+                return None, self._failed(username, now)
+            user = {key: value for key, value in user.items() if key != 'password_hash'}
+            with self._lock:
+                self._sessions[username] = (tag, now + SESSION_TTL, user)
+
+        if user['role'] != role:
+            return None, self._failed(username, now)
+        with self._lock:
+            self._failures.pop(username, None)
+        return user, f"Welcome, {user['full_name']}"
+
+    def _failed(self, username, now):
+        with self._lock:
+            failures = self._failures.get(username, (0, 0.0))[0] + 1
+            lockout = min(MAX_LOCKOUT, 2 ** (failures - FREE_ATTEMPTS)) if failures >= FREE_ATTEMPTS else 0
+            self._failures[username] = (failures, now + lockout)
+            self._sessions.pop(username, None)
+        return LOGIN_FAILED
+
+    def create_admin(self, username, password):
+        # Makes the first account on a database with none, as an Admin.
+        # Returns a Future of (user or None, message), like authenticate.
+        return self._executor.submit(self._create_admin, username.strip().lower(), password)
+
+    def _create_admin(self, username, password):
+        if len(password) < MIN_PASSWORD_LENGTH:
+            return None, f"Choose a password of at least {MIN_PASSWORD_LENGTH} characters"
+        user = {'username': username, 'full_name': 'System Administrator', 'role': 'Admin'}
+        if not self.database.add_first_user(dict(user, password_hash=hash_password(password))):
+            return None, "An account already exists; log in with it"
+        return user, f"Welcome, {user['full_name']}"
+
+    def forget(self, username):
+        # Drops a cached session, e.g. on logout or when its password changes
+        with self._lock:
+            self._sessions.pop(username.strip().lower(), None)
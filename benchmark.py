@@ -0,0 +1,258 @@
+# Headless benchmarks for the admin dashboard's hot paths.
+#
+#   python benchmark.py                       # 1k, 10k and 100k students
+#   python benchmark.py --sizes 1000 5000 --output results.json
+#   python benchmark.py --compare baseline.json
+#
+# Every size gets its own synthetic school, generated from a fixed seed, in
+# a temporary database. Each operation is run twice: once for wall time and
+# once under tracemalloc for peak memory, so tracing never skews the timing.
+# Results are printed as a table and written as JSON; with --compare, any
+# operation more than --tolerance times slower than the baseline fails the run.
+
+import os
+
+# Must be set before Kivy is imported: no window system, no argument parsing
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+import argparse
+import csv
+import json
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from kivy.config import Config
+
+# Clock.tick() would otherwise sleep to hold 60 fps, inside every measurement
+Config.set('graphics', 'maxfps', '0')
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+import kivy
+
+import admin_dashboard
+import fee_reports
+from admin_dashboard import AdminDashboard
+from school_db import SchoolDatabase
+from student_import import FEES_TOTAL
+
+SIZES = (1000, 10000, 100000)
+SEED = 2023
+CLASSES = ['Grade 9A', 'Grade 9B', 'Grade 10A', 'Grade 10B', 'Grade 11A', 'Grade 11B', 'Grade 12A', 'Grade 12B']
+FIRST_NAMES = ['Amina', 'Brian', 'Cynthia', 'David', 'Esther', 'Felix', 'Grace', 'Hassan', 'Irene', 'James',
+               'Kevin', 'Lucy', 'Mercy', 'Nelson', 'Otieno', 'Purity', 'Quincy', 'Ruth', 'Samuel', 'Tabitha']
+LAST_NAMES = ['Achieng', 'Baraka', 'Chebet', 'Kamau', 'Kiprop', 'Mwangi', 'Njeri', 'Odhiambo', 'Wanjiru', 'Zawadi']
+SEARCHES = ['kamau', 'grace', 'S00012', 'mercy wanj', 'zz', 'tabitha kiprop']
+
+
+def generate_students(count, seed=SEED):
+    # The same count and seed always give the same students
+    rng = random.Random(seed)
+    students = []
+    for number in range(count):
+        fees_paid = float(rng.randrange(0, FEES_TOTAL + 1, 50))
+        students.append({
+            'student_number': f"S{number:07d}",
+            'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'class': rng.choice(CLASSES),
+            'fees_paid': fees_paid,
+            'fees_due': FEES_TOTAL - fees_paid
+        })
+    return students
+
+
+def generate_teachers(count, seed=SEED):
+    rng = random.Random(seed + 1)
+    return [{'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+             'email': f"teacher{number}@school.edu",
+             'role': rng.choice(['Teacher', 'Teacher', 'Teacher', 'DoS']),
+             'status': 'Active'} for number in range(count)]
+
+
+def write_csv(path, students):
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=['student_number', 'name', 'class', 'fees_paid'])
+        writer.writeheader()
+        for student in students:
+            writer.writerow({key: student[key] for key in writer.fieldnames})
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.children)
+
+
+def tick(frames=1):
+    for _ in range(frames):
+        Clock.tick()
+
+
+class FileSelection:
+    # Stands in for the file chooser: import_students_csv only reads .selection
+    def __init__(self, paths):
+        self.selection = paths
+
+
+class Bench:
+    def __init__(self, size, workdir):
+        self.size = size
+        self.workdir = workdir
+        self.results = []
+        self.dashboard = None
+
+        students = generate_students(size)
+        self.csv_path = os.path.join(workdir, f"students_{size}.csv")
+        write_csv(self.csv_path, generate_students(size, seed=SEED + size))
+
+        self.database = SchoolDatabase(os.path.join(workdir, f"school_{size}.db"))
+        for offset in range(0, size, 5000):
+            self.database.add_students(students[offset:offset + 5000])
+        for teacher in generate_teachers(max(10, size // 100)):
+            self.database.add_teacher(teacher)
+
+    def measure(self, operation, run, warm_up=False):
+        # Wall time from an untraced run, peak memory from a traced rerun.
+        # warm_up first runs the operation once untimed, for operations whose
+        # first run also builds the views they then reuse.
+        if warm_up:
+            run()
+        started = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - started
+
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        result = {'students': self.size, 'operation': operation, 'seconds': seconds, 'peak_bytes': peak,
+                  'widgets': count_widgets(Window)}
+        self.results.append(result)
+        print(f"{self.size:>8,} {operation:<22} {seconds * 1000:>10.1f} ms {peak / 2 ** 20:>9.1f} MiB "
+              f"{result['widgets']:>8,} widgets", flush=True)
+
+    def build_ui(self):
+        # A whole dashboard: load from the database and build the visible tab,
+        # which the first frame does
+        if self.dashboard is not None:
+            Window.remove_widget(self.dashboard)
+            self.dashboard.event_log.close()
+        self.dashboard = AdminDashboard(database=self.database)
+        Window.add_widget(self.dashboard)
+        tick(3)
+
+    def open_tab(self, title):
+        self.dashboard.tabs.switch_to(self.dashboard.tab_items[title])
+        tick(2)
+
+    def refresh_teacher_list(self):
+        dashboard = self.dashboard
+        # Fresh row views for every teacher, as after a data refresh
+        dashboard.teachers = admin_dashboard.new_teacher_store()
+        dashboard.teachers.extend(self.database.load_teachers())
+        dashboard.refresh_teacher_list()
+        tick()
+
+    def refresh_student_list(self):
+        self.dashboard.refresh_student_list()
+        tick()
+
+    def search_students(self):
+        dashboard = self.dashboard
+        for query in SEARCHES:
+            dashboard.search_input.text = query
+            dashboard.search_students(None)
+            future = dashboard._search_futures['students']
+            while not future.done():
+                time.sleep(0.0005)
+            tick()
+        dashboard.search_input.text = ''
+        dashboard.clear_search(None)
+        tick()
+
+    def import_students_csv(self):
+        dashboard = self.dashboard
+        dashboard.show_bulk_import_popup(None)
+        dashboard.file_chooser = FileSelection([self.csv_path])
+        dashboard.import_students_csv(None)
+        while dashboard._import_running():
+            tick()
+        tick()
+
+    def run(self):
+        self.measure('build_ui', self.build_ui)
+        self.open_tab('User Management')
+        self.measure('refresh_teacher_list', self.refresh_teacher_list, warm_up=True)
+        self.open_tab('Student Management')
+        self.measure('refresh_student_list', self.refresh_student_list, warm_up=True)
+        self.measure('search_students', self.search_students, warm_up=True)
+        self.measure('import_students_csv', self.import_students_csv)
+        Window.remove_widget(self.dashboard)
+        self.dashboard.event_log.close()
+        self.database.close()
+        return self.results
+
+
+def compare(results, baseline_path, tolerance):
+    # Returns the operations that got slower than the baseline allows
+    with open(baseline_path, encoding='utf-8') as baseline_file:
+        baseline = {(result['students'], result['operation']): result
+                    for result in json.load(baseline_file)['results']}
+    regressions = []
+    for result in results:
+        before = baseline.get((result['students'], result['operation']))
+        if before and result['seconds'] > before['seconds'] * tolerance:
+            regressions.append(f"{result['operation']} at {result['students']:,} students: "
+                               f"{before['seconds'] * 1000:.1f} ms -> {result['seconds'] * 1000:.1f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the admin dashboard headlessly.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='student counts to benchmark')
+    parser.add_argument('--output', default='benchmark_results.json', help='where to write the JSON results')
+    parser.add_argument('--compare', metavar='BASELINE', help='earlier results to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='slowdown factor against the baseline that counts as a regression')
+    args = parser.parse_args()
+
+    # Background tab building would land inside whatever is being measured
+    AdminDashboard.TAB_PREFETCH_DELAY = None
+
+    results = []
+    workdir = tempfile.mkdtemp(prefix='school_bench_')
+    try:
+        print(f"{'students':>8} {'operation':<22} {'wall time':>13} {'peak memory':>13} {'widgets':>16}")
+        for size in args.sizes:
+            results.extend(Bench(size, workdir).run())
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as output_file:
+        json.dump({'date': datetime.now().isoformat(timespec='seconds'),
+                   'python': platform.python_version(),
+                   'kivy': kivy.__version__,
+                   'platform': platform.platform(),
+                   'numpy': fee_reports.load_numpy() is not None,
+                   'results': results}, output_file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
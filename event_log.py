@@ -0,0 +1,91 @@
+# In-memory audit log of dashboard events.
+# Events live in a fixed-size ring buffer: adding one is O(1) and the oldest
+# falls off once the buffer is full, so memory stays bounded however long
+# the office leaves the app open. The buffer is indexable, which lets a
+# virtualized grid show it without copying. Events can also be spilled to a
+# rotating file; the writes happen on a listener thread, not the caller's.
+
+import logging
+import logging.handlers
+import queue
+import time
+from collections import namedtuple
+
+CAPACITY = 5000  # Events kept in memory
+MAX_BYTES = 1024 * 1024  # Size of the on-disk log before it rotates
+BACKUPS = 3  # Rotated files kept next to the current one
+LEVELS = {'INFO': logging.INFO, 'WARNING': logging.WARNING, 'ERROR': logging.ERROR}
+FILE_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+# sequence counts every event ever added, so it also says whether an event
+# is still in the buffer
+LogEvent = namedtuple('LogEvent', 'sequence created level source message')
+
+
+class EventLog:
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self._events = [None] * capacity
+        self.next_sequence = 0
+        self._listener = None
+        self._file_queue = None
+
+    def __len__(self):
+        return min(self.next_sequence, self.capacity)
+
+    def __getitem__(self, index):
+        # Oldest event first
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('event index out of range')
+        return self._events[(self.first_sequence + index) % self.capacity]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def first_sequence(self):
+        # Sequence number of the oldest event still held
+        return self.next_sequence - len(self)
+
+    def add(self, level, source, message):
+        event = LogEvent(self.next_sequence, time.time(), level, source, message)
+        self._events[self.next_sequence % self.capacity] = event
+        self.next_sequence += 1
+        if self._file_queue is not None:
+            self._file_queue.put_nowait(logging.makeLogRecord({
+                'name': source, 'levelname': level, 'levelno': LEVELS[level],
+                'msg': message, 'created': event.created}))
+        return event
+
+    def matching(self, min_level='INFO', text=''):
+        return [event for event in self if matches(event, min_level, text)]
+
+    def spill_to(self, path, max_bytes=MAX_BYTES, backups=BACKUPS):
+        # Also append every event to a rotating file at path
+        self.close()
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                       encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        self._file_queue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(self._file_queue, handler)
+        self._listener.start()
+
+    def close(self):
+        # Stops the file writer once it has written everything queued
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+            self._file_queue = None
+
+
+def matches(event, min_level='INFO', text=''):
+    # text is matched case-insensitively against the source and message;
+    # pass it already lowercased
+    if LEVELS[event.level] < LEVELS[min_level]:
+        return False
+    return not text or text in event.message.lower() or text in event.source.lower()
@@ -0,0 +1,146 @@
+# Streaming export of records to CSV or XLSX.
+# Rows are pulled from a generator one at a time and written straight to the
+# file, so memory stays flat whatever the row count and no copy of the table
+# is ever built. XLSX is written with zipfile: the worksheet is streamed into
+# its archive member using inline strings, so there is no shared-string table
+# to hold either. ExportJob.run is meant for a worker thread; a cancelled job
+# deletes its half-written file.
+
+import csv
+import os
+import re
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+FLUSH_ROWS = 1000  # Worksheet rows buffered per write into the archive
+
+# Characters XML 1.0 does not allow, even escaped
+_XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Records" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'),
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+        '<cellXfs count="1"><xf xfId="0"/></cellXfs>'
+        '</styleSheet>'),
+}
+_SHEET_START = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+_SHEET_END = '</sheetData></worksheet>'
+
+
+def write_csv(path, headers, rows):
+    # utf-8-sig so Excel opens it as UTF-8; the importer reads it back as is
+    with open(path, 'w', newline='', encoding='utf-8-sig') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def _xlsx_cell(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    return f'<c t="inlineStr"><is><t>{escape(_XML_ILLEGAL.sub("", str(value)))}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def write_xlsx(path, headers, rows):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+        # force_zip64: the sheet's size is not known before it is written
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            buffer = [_SHEET_START, _xlsx_row(headers)]
+            for values in rows:
+                buffer.append(_xlsx_row(values))
+                if len(buffer) >= FLUSH_ROWS:
+                    sheet.write(''.join(buffer).encode('utf-8'))
+                    buffer = []
+            buffer.append(_SHEET_END)
+            sheet.write(''.join(buffer).encode('utf-8'))
+
+
+WRITERS = {'.csv': write_csv, '.xlsx': write_xlsx}
+
+
+class ExportJob:
+    # State shared between the writing worker and the UI thread, which only
+    # reads the counters to show progress.
+    # rows: any sized sequence of records (e.g. a grid's current rows);
+    # columns: (header, getter) pairs, each getter taking one record.
+    def __init__(self, path, rows, columns):
+        self.path = path
+        self.rows = rows
+        self.columns = columns
+        self.total = len(rows)
+        self.written = 0
+        self.started = time.perf_counter()
+        self.cancelled = False
+        self.done = False
+        self.error = None
+
+    def run(self):
+        writer = WRITERS[os.path.splitext(self.path)[1].lower()]
+        try:
+            writer(self.path, [header for header, getter in self.columns], self._values())
+            if self.cancelled:
+                os.remove(self.path)  # Never leave a half-written export behind
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.done = True
+
+    def _values(self):
+        getters = [getter for header, getter in self.columns]
+        for record in self.rows:
+            if self.cancelled:
+                return
+            yield [getter(record) for getter in getters]
+            self.written += 1
+
+    @property
+    def progress(self):
+        return 100.0 * self.written / self.total if self.total else 100.0
@@ -0,0 +1,276 @@
+# SQLite storage for the school system.
+# The database runs in WAL mode so the UI can keep reading while a batch is
+# being written. Every query is a constant SQL string below: sqlite3 compiles
+# each one once and reuses the prepared statement from its statement cache.
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'school.db')
+PAGE_SIZE = 5000  # Rows fetched per query when reading a whole table
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS teachers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL DEFAULT 'Teacher',
+    status TEXT NOT NULL DEFAULT 'Active'
+);
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    student_number TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL DEFAULT '',
+    class TEXT NOT NULL DEFAULT '',
+    fees_paid REAL NOT NULL DEFAULT 0,
+    fees_due REAL NOT NULL DEFAULT 0,
+    active INTEGER NOT NULL DEFAULT 1,
+    last_payment INTEGER NOT NULL DEFAULT 0  -- date.toordinal() of the last payment, 0 if none
+);
+CREATE INDEX IF NOT EXISTS idx_students_number ON students (student_number);
+CREATE INDEX IF NOT EXISTS idx_students_class ON students (class);
+CREATE INDEX IF NOT EXISTS idx_students_fee_status ON students ((fees_due <= 0));
+CREATE TABLE IF NOT EXISTS classes (
+    position INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS subjects (
+    position INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,  -- lowercase
+    full_name TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL,
+    password_hash TEXT NOT NULL  -- auth.hash_password() format
+);
+CREATE TABLE IF NOT EXISTS id_sequences (
+    name TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL
+);
+'''
+
+SELECT_TEACHERS = 'SELECT id, name, email, role, status FROM teachers ORDER BY id'
+INSERT_TEACHER = 'INSERT INTO teachers (id, name, email, role, status) VALUES (?, ?, ?, ?, ?)'
+UPDATE_TEACHER = 'UPDATE teachers SET name = ?, email = ?, role = ?, status = ? WHERE id = ?'
+DELETE_TEACHER = 'DELETE FROM teachers WHERE id = ?'
+
+SELECT_STUDENT_PAGE = '''SELECT id, student_number, name, class, fees_paid, fees_due, active, last_payment
+FROM students WHERE id > ? ORDER BY id LIMIT ?'''
+INSERT_STUDENT = '''INSERT INTO students (id, student_number, name, class, fees_paid, fees_due, active,
+last_payment) VALUES (?, ?, ?, ?, ?, ?, ?, ?)'''
+UPDATE_STUDENT = '''UPDATE students SET student_number = ?, name = ?, class = ?, fees_paid = ?,
+fees_due = ?, active = ?, last_payment = ? WHERE id = ?'''
+COUNT_STUDENTS = 'SELECT COUNT(*) FROM students'
+
+# Ids come from a persisted counter per table rather than MAX(id) + 1, so an
+# id is never handed out twice, even after the row holding it is deleted
+RESERVE_IDS = 'UPDATE id_sequences SET last_id = last_id + ? WHERE name = ?'
+LAST_ID = 'SELECT last_id FROM id_sequences WHERE name = ?'
+INIT_SEQUENCES = '''INSERT OR IGNORE INTO id_sequences (name, last_id)
+SELECT 'teachers', COALESCE(MAX(id), 0) FROM teachers
+UNION ALL SELECT 'students', COALESCE(MAX(id), 0) FROM students'''
+
+SELECT_USER = 'SELECT username, full_name, role, password_hash FROM users WHERE username = ?'
+INSERT_USER = 'INSERT OR REPLACE INTO users (username, full_name, role, password_hash) VALUES (?, ?, ?, ?)'
+COUNT_USERS = 'SELECT COUNT(*) FROM users'
+DELETE_USERS_WITH_HASH = 'DELETE FROM users WHERE password_hash = ?'
+
+SELECT_CLASSES = 'SELECT name FROM classes ORDER BY position'
+INSERT_CLASS = 'INSERT OR IGNORE INTO classes (name) VALUES (?)'
+SELECT_SUBJECTS = 'SELECT name FROM subjects ORDER BY position'
+INSERT_SUBJECT = 'INSERT OR IGNORE INTO subjects (name) VALUES (?)'
+
+# First-run contents, so a fresh install opens with the familiar sample school
+SAMPLE_TEACHERS = [
+    {'name': 'John Smith', 'email': 'john@school.edu', 'role': 'Teacher', 'status': 'Active'},
+    {'name': 'Sarah Johnson', 'email': 'sarah@school.edu', 'role': 'DoS', 'status': 'Active'}
+]
+SAMPLE_STUDENTS = [
+    {'id': 1001, 'student_number': 'S2023001', 'name': 'Michael Brown', 'class': 'Grade 10A', 'fees_paid': 1500,
+     'fees_due': 500, 'last_payment': 738767},  # 2023-09-04
+    {'id': 1002, 'student_number': 'S2023002', 'name': 'Emily Davis', 'class': 'Grade 9B', 'fees_paid': 2000,
+     'fees_due': 0, 'last_payment': 738760}  # 2023-08-28
+]
+# The hash of the admin / admin account earlier versions created. There is
+# no sample login: the first start has the administrator choose a password.
+RETIRED_ADMIN_HASH = ('scrypt$16384$8$1$9dbed30463120b6fa4804ff8d6a8c627$'
+                      '6c007209da548ecf98661eac845fb7e932856131b7009ed6f3b9d922dd4c27b7')
+SAMPLE_CLASSES = ['Grade 10A', 'Grade 10B', 'Grade 9A', 'Grade 9B']
+SAMPLE_SUBJECTS = ['Math', 'Science', 'English', 'History']
+
+
+def _student_params(student):
+    return (student.get('student_number', ''), student['name'], student['class'],
+            student['fees_paid'], student['fees_due'], int(student.get('active', True)),
+            student.get('last_payment', 0))
+
+
+class SchoolDatabase:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        # One connection shared by the UI and worker threads, serialised by
+        # the lock; WAL keeps readers from blocking on a pending write
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        self.writes = 0  # Committed write transactions, to spot changes made during a read
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+            if self._conn.execute(COUNT_STUDENTS).fetchone()[0] == 0 and not self.load_teachers():
+                self._seed()
+            self._conn.execute(INIT_SEQUENCES)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def transaction(self):
+        # Groups writes into one transaction (and one fsync)
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+            self.writes += 1
+
+    def _reserve_ids(self, conn, table, count):
+        # Takes the next `count` ids of the table's sequence and returns the
+        # first. The UPDATE comes first so the write lock is held before the
+        # counter is read. Call inside a transaction.
+        conn.execute(RESERVE_IDS, (count, table))
+        return conn.execute(LAST_ID, (table,)).fetchone()[0] - count + 1
+
+    def _migrate(self):
+        # Databases created before the last_payment date was tracked
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(students)')]
+        if 'last_payment' not in columns:
+            self._conn.execute('ALTER TABLE students ADD COLUMN last_payment INTEGER NOT NULL DEFAULT 0')
+        # Databases seeded with the admin / admin account: anyone could guess
+        # it, so it goes and the next start asks for a new administrator
+        self._conn.execute(DELETE_USERS_WITH_HASH, (RETIRED_ADMIN_HASH,))
+
+    def _seed(self):
+        with self.transaction() as conn:
+            for teacher_id, teacher in enumerate(SAMPLE_TEACHERS, 1):
+                conn.execute(INSERT_TEACHER, (teacher_id, teacher['name'], teacher['email'], teacher['role'],
+                                              teacher['status']))
+            conn.executemany(INSERT_STUDENT, [(student['id'],) + _student_params(student)
+                                              for student in SAMPLE_STUDENTS])
+            conn.executemany(INSERT_CLASS, [(name,) for name in SAMPLE_CLASSES])
+            conn.executemany(INSERT_SUBJECT, [(name,) for name in SAMPLE_SUBJECTS])
+
+    # Teachers
+    def load_teachers(self):
+        with self._lock:
+            rows = self._conn.execute(SELECT_TEACHERS).fetchall()
+        return [{'id': row[0], 'name': row[1], 'email': row[2], 'role': row[3], 'status': row[4]}
+                for row in rows]
+
+    def add_teacher(self, teacher):
+        # Stores the teacher and sets its new id
+        with self.transaction() as conn:
+            teacher_id = self._reserve_ids(conn, 'teachers', 1)
+            conn.execute(INSERT_TEACHER, (teacher_id, teacher['name'], teacher['email'], teacher['role'],
+                                          teacher.get('status', 'Active')))
+        teacher['id'] = teacher_id
+        return teacher
+
+    def update_teacher(self, teacher):
+        with self.transaction() as conn:
+            conn.execute(UPDATE_TEACHER, (teacher['name'], teacher['email'], teacher['role'],
+                                          teacher.get('status', 'Active'), teacher['id']))
+
+    def delete_teacher(self, teacher_id):
+        with self.transaction() as conn:
+            conn.execute(DELETE_TEACHER, (teacher_id,))
+
+    # Students
+    def count_students(self):
+        with self._lock:
+            return self._conn.execute(COUNT_STUDENTS).fetchone()[0]
+
+    def iter_student_pages(self, page_size=PAGE_SIZE):
+        # Keyset pagination: each page continues after the last id seen, so
+        # reading the whole table never needs an OFFSET scan or a fetchall
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(SELECT_STUDENT_PAGE, (last_id, page_size)).fetchall()
+            if not rows:
+                return
+            yield [{'id': row[0], 'student_number': row[1], 'name': row[2], 'class': row[3],
+                    'fees_paid': row[4], 'fees_due': row[5], 'active': bool(row[6]), 'last_payment': row[7]}
+                   for row in rows]
+            last_id = rows[-1][0]
+
+    def add_students(self, students):
+        # Inserts a batch with one executemany in one transaction. The batch
+        # reserves a block of ids in one step and numbers the students in the
+        # order given.
+        if not students:
+            return students
+        with self.transaction() as conn:
+            first_id = self._reserve_ids(conn, 'students', len(students))
+            for student_id, student in enumerate(students, first_id):
+                student['id'] = student_id
+            conn.executemany(INSERT_STUDENT, [(student['id'],) + _student_params(student) for student in students])
+        return students
+
+    def update_student(self, student):
+        with self.transaction() as conn:
+            conn.execute(UPDATE_STUDENT, _student_params(student) + (student['id'],))
+
+    # Login accounts
+    def load_user(self, username):
+        with self._lock:
+            row = self._conn.execute(SELECT_USER, (username.lower(),)).fetchone()
+        if row is None:
+            return None
+        return {'username': row[0], 'full_name': row[1], 'role': row[2], 'password_hash': row[3]}
+
+    def has_users(self):
+        with self._lock:
+            return self._conn.execute(COUNT_USERS).fetchone()[0] > 0
+
+    def add_user(self, user):
+        # Adds the account, or replaces the one with the same username
+        with self.transaction() as conn:
+            conn.execute(INSERT_USER, (user['username'].lower(), user.get('full_name', ''), user['role'],
+                                       user['password_hash']))
+
+    def add_first_user(self, user):
+        # Adds the account only while there are none, in the same
+        # transaction as the check, so only one first account can be made.
+        # Returns whether it was added.
+        with self.transaction() as conn:
+            if conn.execute(COUNT_USERS).fetchone()[0]:
+                return False
+            conn.execute(INSERT_USER, (user['username'].lower(), user.get('full_name', ''), user['role'],
+                                       user['password_hash']))
+        return True
+
+    # Classes and subjects
+    def load_classes(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute(SELECT_CLASSES)]
+
+    def add_class(self, name):
+        with self.transaction() as conn:
+            conn.execute(INSERT_CLASS, (name,))
+
+    def load_subjects(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute(SELECT_SUBJECTS)]
+
+    def add_subject(self, name):
+        with self.transaction() as conn:
+            conn.execute(INSERT_SUBJECT, (name,))
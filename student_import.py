@@ -0,0 +1,228 @@
+# Bulk student import pipeline.
+# The parser runs on a worker thread, or for big or several files in worker
+# processes that run this file as a script, and hands parsed rows to the UI
+# thread in chunks through ImportJob.chunks. The UI thread does the database
+# writes.
+
+import codecs
+import csv
+import json
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import time
+from datetime import date
+
+FEES_TOTAL = 2000  # Term fee every student is billed
+CHUNK_SIZE = 250  # Rows handed to the UI thread at a time
+SHARD_BYTES = 4 * 1024 * 1024  # Byte range of a file parsed by one worker process
+
+
+def parse_student_row(row):
+    # Returns the student record for a CSV row, or None if the row is invalid
+    try:
+        fees_paid = float(row.get('fees_paid', 0))
+        # Optional ISO date (YYYY-MM-DD) of the last payment, kept as an ordinal
+        last_payment = row.get('last_payment')
+        last_payment = date.fromisoformat(last_payment).toordinal() if last_payment else 0
+    except (TypeError, ValueError):
+        return None
+    return {
+        'student_number': row.get('student_number') or '',
+        'name': row.get('name') or '',
+        'class': row.get('class') or '',
+        'fees_paid': fees_paid,
+        'fees_due': FEES_TOTAL - fees_paid,
+        'last_payment': last_payment
+    }
+
+
+def _decoded_lines(raw_file, progress):
+    # Decodes the file line by line while counting the raw bytes consumed,
+    # which is what the progress bar is based on
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    for raw_line in raw_file:
+        progress[0] += len(raw_line)
+        yield decoder.decode(raw_line)
+
+
+def iter_student_chunks(path, chunk_size=CHUNK_SIZE):
+    # Streams the CSV and yields (students, rejected, bytes_read) every
+    # chunk_size rows, so the whole file is never held in memory at once
+    progress = [0]
+    with open(path, 'rb') as raw_file:
+        reader = csv.DictReader(_decoded_lines(raw_file, progress))
+        students = []
+        rejected = 0
+        for row in reader:
+            student = parse_student_row(row)
+            if student is None:
+                rejected += 1  # Skip rows with invalid data
+            else:
+                students.append(student)
+            if len(students) + rejected >= chunk_size:
+                yield students, rejected, progress[0]
+                students = []
+                rejected = 0
+        yield students, rejected, progress[0]
+
+
+def read_header(path):
+    # Returns the CSV field names and the byte offset where the data starts
+    with open(path, 'rb') as raw_file:
+        first_line = raw_file.readline()
+    fieldnames = next(csv.reader([first_line.decode('utf-8-sig')]), [])
+    return fieldnames, len(first_line)
+
+
+def plan_shards(paths, shard_bytes=SHARD_BYTES):
+    # Splits every file into byte ranges, in a fixed order: by file, then by
+    # offset. Merging results in this order keeps the import deterministic.
+    shards = []
+    for path in paths:
+        fieldnames, start = read_header(path)
+        size = os.path.getsize(path)
+        while start < size:
+            end = min(size, start + shard_bytes)
+            shards.append((path, start, end, fieldnames))
+            start = end
+    return shards
+
+
+def parse_shard(path, start, end, fieldnames):
+    # Parses the rows whose line starts inside [start, end). A line that
+    # straddles `start` belongs to the previous shard. Byte ranges assume one
+    # record per line, which holds for the registry's enrolment exports.
+    lines = []
+    with open(path, 'rb') as raw_file:
+        raw_file.seek(max(0, start - 1))
+        if start > 0 and raw_file.read(1) != b'\n':
+            raw_file.readline()
+        position = raw_file.tell()
+        while position < end:
+            line = raw_file.readline()
+            if not line:
+                break
+            position += len(line)
+            lines.append(line.decode('utf-8'))
+
+    students = []
+    rejected = 0
+    for row in csv.DictReader(lines, fieldnames=fieldnames):
+        student = parse_student_row(row)
+        if student is None:
+            rejected += 1  # Skip rows with invalid data
+        else:
+            students.append(student)
+    return students, rejected
+
+
+def start_shard_worker(path, start, end, fieldnames):
+    # Parses one shard in a new process running this file as its script.
+    # A multiprocessing pool would re-run the app's __main__ in every worker
+    # on platforms that spawn (Windows, macOS), importing Kivy and opening a
+    # window per worker; this stdlib-only module is all a worker imports.
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), path, str(start), str(end),
+                             json.dumps(fieldnames)], stdout=subprocess.PIPE)
+
+
+def shard_result(worker):
+    # Waits for a worker and returns its (students, rejected)
+    output = worker.stdout.read()
+    worker.stdout.close()
+    if worker.wait():
+        raise RuntimeError(f"import worker exited with code {worker.returncode}")
+    return pickle.loads(output)
+
+
+class ImportJob:
+    # State shared between the parsing worker and the UI thread.
+    # The worker only writes to `chunks` and the done/error flags; the UI
+    # thread owns the imported/rejected counters it commits.
+    # Each chunk is (students, rejected, bytes_read, prepared).
+    def __init__(self, paths, prepare=None):
+        self.paths = list(paths)
+        # Optional per-student work (e.g. search index entries) done here on
+        # the worker rather than on the UI thread
+        self.prepare = prepare
+        self.total_bytes = sum(os.path.getsize(path) for path in self.paths) or 1
+        self.bytes_read = 0
+        self.imported = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+        self.chunks = queue.Queue()
+        self.cancelled = False
+        self.done = False
+        self.error = None
+
+    def run(self):
+        try:
+            done_bytes = 0
+            for path in self.paths:
+                for students, rejected, bytes_read in iter_student_chunks(path):
+                    if self.cancelled:
+                        return
+                    self._put(students, rejected, done_bytes + bytes_read)
+                done_bytes += os.path.getsize(path)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.done = True
+
+    def _put(self, students, rejected, bytes_read):
+        prepared = [self.prepare(student) for student in students] if self.prepare else None
+        self.chunks.put((students, rejected, bytes_read, prepared))
+
+    @property
+    def progress(self):
+        return min(100.0, 100.0 * self.bytes_read / self.total_bytes)
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.perf_counter() - self.started
+        return (self.imported + self.rejected) / elapsed if elapsed > 0 else 0.0
+
+
+class ParallelImportJob(ImportJob):
+    # Parses files, or byte-range shards of one large file, in up to
+    # `workers` processes at a time. Shard results are merged in plan order
+    # rather than completion order, so ids come out the same however the
+    # workers are scheduled.
+    def __init__(self, paths, prepare=None, workers=None):
+        super().__init__(sorted(paths), prepare)
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self):
+        workers = {}  # shard number -> its worker process, while running
+        try:
+            shards = plan_shards(self.paths)
+            done_bytes = 0
+            for number, (path, start, end, fieldnames) in enumerate(shards):
+                # Keep the next shards parsing while this one is merged
+                for ahead in range(number, min(len(shards), number + self.workers)):
+                    if ahead not in workers:
+                        workers[ahead] = start_shard_worker(*shards[ahead])
+                students, rejected = shard_result(workers.pop(number))
+                if self.cancelled:
+                    return
+                done_bytes += end - start
+                for offset in range(0, len(students) or 1, CHUNK_SIZE):
+                    self._put(students[offset:offset + CHUNK_SIZE], rejected if offset == 0 else 0, done_bytes)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            for worker in workers.values():
+                worker.kill()  # Cancelled or failed: the rest are not needed
+                worker.stdout.close()
+                worker.wait()
+            self.done = True
+
+
+if __name__ == '__main__':
+    # A ParallelImportJob worker: path, start, end and the JSON field names
+    # on the command line, the parsed shard pickled to stdout
+    shard_path, shard_start, shard_end, shard_fields = sys.argv[1:5]
+    pickle.dump(parse_shard(shard_path, int(shard_start), int(shard_end), json.loads(shard_fields)),
+                sys.stdout.buffer, pickle.HIGHEST_PROTOCOL)
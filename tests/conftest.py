@@ -0,0 +1,86 @@
+# Shared fixtures for the dashboard tests. Kivy runs headless: no window
+# system, no argument parsing, and the clock is stepped by hand.
+import os
+import random
+import sys
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from kivy.clock import Clock
+from kivy.core.window import Window
+
+from admin_dashboard import AdminDashboard, SORT_TRANSFORMS
+from school_db import SchoolDatabase
+from student_import import FEES_TOTAL
+
+CLASSES = ['Grade 9A', 'Grade 9B', 'Grade 10A', 'grade 10B']
+# Mixed case and repeats, so ties and case-insensitive order both matter
+NAMES = ['Amina Kamau', 'amina kamau', 'Brian Otieno', 'Cynthia Njeri', 'david Mwangi', 'Esther Achieng']
+
+
+def tick(frames=1):
+    for _ in range(frames):
+        Clock.tick()
+
+
+def make_students(count, seed=7):
+    rng = random.Random(seed)
+    students = []
+    for number in range(count):
+        fees_paid = float(rng.randrange(0, FEES_TOTAL + 1, 250))
+        students.append({'student_number': f"S{rng.randrange(1000):04d}",
+                         'name': rng.choice(NAMES),
+                         'class': rng.choice(CLASSES),
+                         'fees_paid': fees_paid,
+                         'fees_due': FEES_TOTAL - fees_paid,
+                         'active': rng.random() < 0.7})
+    return students
+
+
+@pytest.fixture
+def dashboard(tmp_path, monkeypatch):
+    # A dashboard over 300 students with its student and fee grids built,
+    # paging a few rows at a time so every test crosses many pages
+    monkeypatch.setattr(AdminDashboard, 'TAB_PREFETCH_DELAY', None)
+    monkeypatch.setattr(AdminDashboard, 'PAGE_ROWS', 7)
+    database = SchoolDatabase(str(tmp_path / 'school.db'))
+    database.add_students(make_students(300))
+    dashboard = AdminDashboard(database=database)
+    Window.add_widget(dashboard)
+    tick(3)
+    for title in ('Student Management', 'Financial Management'):
+        dashboard.tabs.switch_to(dashboard.tab_items[title])
+        tick(2)
+    yield dashboard
+    Window.remove_widget(dashboard)
+    dashboard.event_log.close()
+    database.close()
+
+
+def brute_order(dashboard, column, descending=False, positions=None):
+    # The order a grid should show, by sorting every row from scratch
+    store = dashboard.students
+    if positions is None:
+        positions = list(store.rows().positions)
+    if column is None:
+        return sorted(positions, reverse=descending)
+    transform = SORT_TRANSFORMS.get(column) or (lambda value: value)
+    return sorted(positions, key=lambda position: (transform(store[position][column]), position),
+                  reverse=descending)
+
+
+def shown_pages(dashboard, table):
+    # Every row the grid shows, turning pages from the first to the last
+    dashboard.turn_page(table, 'first')
+    grid = dashboard._grid(table)
+    shown = []
+    while True:
+        shown.extend(record.position for record in grid.data)
+        anchor = dashboard._grid_pages[table]['anchor']
+        dashboard.turn_page(table, 'next')
+        if dashboard._grid_pages[table]['anchor'] == anchor:
+            return shown
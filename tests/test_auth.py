@@ -0,0 +1,146 @@
+from types import SimpleNamespace
+
+import pytest
+from kivy.uix.screenmanager import Screen
+
+import auth
+from auth import Authenticator, FREE_ATTEMPTS, LOGIN_FAILED, MAX_LOCKOUT, hash_password
+from conftest import tick
+from school_db import SchoolDatabase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(auth.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SchoolDatabase(str(tmp_path / 'school.db'))
+    database.add_user({'username': 'Head', 'full_name': 'Head Teacher', 'role': 'Admin',
+                       'password_hash': hash_password('correct horse')})
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def authenticator(database):
+    authenticator = Authenticator(database)
+    yield authenticator
+    authenticator._executor.shutdown()
+
+
+@pytest.fixture
+def hashes(monkeypatch):
+    # Counts the slow password checks
+    checked = []
+
+    def verify_password(password, encoded):
+        checked.append(password)
+        return real_verify(password, encoded)
+
+    real_verify = auth.verify_password
+    monkeypatch.setattr(auth, 'verify_password', verify_password)
+    return checked
+
+
+def login(authenticator, password, username='head', role='Admin'):
+    return authenticator.authenticate(username, password, role).result()
+
+
+def test_correct_login(authenticator):
+    user, message = login(authenticator, 'correct horse', username=' HEAD ')
+    assert user == {'username': 'head', 'full_name': 'Head Teacher', 'role': 'Admin'}
+    assert message == "Welcome, Head Teacher"
+
+
+@pytest.mark.parametrize('username, password, role', [('head', 'wrong', 'Admin'),
+                                                      ('nobody', 'correct horse', 'Admin'),
+                                                      ('head', 'correct horse', 'Teacher')])
+def test_wrong_login(authenticator, username, password, role):
+    assert login(authenticator, password, username, role) == (None, LOGIN_FAILED)
+
+
+def test_lockout_starts_after_free_attempts(authenticator, clock, hashes):
+    for _ in range(FREE_ATTEMPTS - 1):
+        assert login(authenticator, 'wrong') == (None, LOGIN_FAILED)
+    # Not locked yet: the right password still gets in
+    assert login(authenticator, 'correct horse')[0] is not None
+
+    for _ in range(FREE_ATTEMPTS):
+        assert login(authenticator, 'wrong') == (None, LOGIN_FAILED)
+    checked = len(hashes)
+    user, message = login(authenticator, 'correct horse')
+    assert user is None
+    assert message.endswith("try again in 1 s")
+    assert len(hashes) == checked  # Refused without hashing
+
+    clock.now += 1
+    assert login(authenticator, 'correct horse')[0] is not None
+
+
+def test_lockout_rounds_the_wait_up(authenticator, clock):
+    for _ in range(FREE_ATTEMPTS):
+        login(authenticator, 'wrong')
+    clock.now += 0.75
+    assert login(authenticator, 'correct horse')[1].endswith("try again in 1 s")
+
+
+def test_lockout_doubles_up_to_the_cap(authenticator, clock):
+    for _ in range(FREE_ATTEMPTS - 1):
+        login(authenticator, 'wrong')
+    waits = []
+    for _ in range(12):
+        assert login(authenticator, 'wrong') == (None, LOGIN_FAILED)
+        # Every failure from here on locks; the lockout shows in the refusal
+        waits.append(int(login(authenticator, 'correct horse')[1].rsplit(' ', 2)[1]))
+        clock.now += MAX_LOCKOUT
+    assert waits == [1, 2, 4, 8, 16, 32, 64, 128, 256, MAX_LOCKOUT, MAX_LOCKOUT, MAX_LOCKOUT]
+
+
+def test_cached_session_skips_the_hash(authenticator, clock, hashes):
+    assert login(authenticator, 'correct horse')[0] is not None
+    assert len(hashes) == 1
+    clock.now += auth.SESSION_TTL - 1
+    assert login(authenticator, 'correct horse')[0] is not None
+    assert len(hashes) == 1
+
+    # A different password, or an expired session, is checked in full
+    assert login(authenticator, 'wrong') == (None, LOGIN_FAILED)
+    assert len(hashes) == 2
+    assert login(authenticator, 'correct horse')[0] is not None
+    clock.now += auth.SESSION_TTL + 1
+    assert login(authenticator, 'correct horse')[0] is not None
+    assert len(hashes) == 4
+
+
+def test_logout_drops_the_cached_session(database, hashes):
+    from LoginApp import LoginApp
+
+    app = LoginApp()
+    app.build()
+    app._database = database
+    app.manager.add_widget(Screen(name='admin_dashboard'))
+    authenticator = app.get_authenticator()
+    try:
+        user, message = login(authenticator, 'correct horse')
+        app._show_dashboard(app.manager.get_screen('admin_dashboard'), SimpleNamespace(**user))
+        assert login(authenticator, 'correct horse')[0] is not None
+        assert len(hashes) == 1
+
+        app.manager.current = 'login'  # AdminDashboard.logout
+        tick(2)
+        assert login(authenticator, 'correct horse')[0] is not None
+        assert len(hashes) == 2
+    finally:
+        authenticator._executor.shutdown()
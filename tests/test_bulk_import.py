@@ -0,0 +1,54 @@
+import csv
+
+from conftest import tick
+
+
+class FileSelection:
+    def __init__(self, paths):
+        self.selection = paths
+
+
+def write_students(path, count, prefix):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['student_number', 'name', 'class', 'fees_paid'])
+        for number in range(count):
+            writer.writerow([f"{prefix}{number:05d}", f"Student {prefix}{number}", 'Grade 9A', 500])
+    return str(path)
+
+
+def start_import(dashboard, path):
+    dashboard.show_bulk_import_popup(None)
+    dashboard.file_chooser = FileSelection([path])
+    dashboard.import_students_csv(None)
+
+
+def test_import_progress_cannot_be_dismissed(dashboard, tmp_path):
+    start_import(dashboard, write_students(tmp_path / 'first.csv', 2000, 'A'))
+    assert dashboard._import_running()
+    assert not dashboard.popup.auto_dismiss
+    while dashboard._import_running():
+        tick()
+
+
+def test_second_import_is_refused_while_one_runs(dashboard, tmp_path):
+    before = dashboard.students.live_count
+    first = write_students(tmp_path / 'first.csv', 3000, 'A')
+    second = write_students(tmp_path / 'second.csv', 3000, 'B')
+    start_import(dashboard, first)
+    tick()
+    start_import(dashboard, second)
+    assert 'already running' in dashboard.status_message
+    while dashboard._import_running():
+        tick()
+    tick()
+
+    assert dashboard.students.live_count == before + 3000
+    assert dashboard.database.count_students() == before + 3000
+    assert dashboard.status_message.startswith('Imported 3000 students')
+
+    # Once it has finished the next import goes ahead
+    start_import(dashboard, second)
+    while dashboard._import_running():
+        tick()
+    assert dashboard.students.live_count == before + 6000
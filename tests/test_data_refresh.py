@@ -0,0 +1,81 @@
+# Refresh Data swaps in a model reloaded from the database; the grids must
+# stay on the page they show.
+import time
+
+import pytest
+
+from conftest import tick
+from test_grid_filters import set_filters
+
+
+def settle(dashboard):
+    # Lets queued searches finish and their results be applied
+    for future in list(dashboard._search_futures.values()):
+        future.result()
+    tick(2)
+
+
+def refresh(dashboard):
+    before = dashboard.students
+    dashboard._finish_refresh(dashboard.load_snapshot(dashboard.database), time.perf_counter())
+    settle(dashboard)
+    assert dashboard.students is not before
+
+
+def shown(dashboard, table):
+    grid = dashboard._grid(table)
+    return ([record['id'] for record in grid.data], grid.scroll_y,
+            dashboard._grid_pages[table]['pager_label'].text)
+
+
+@pytest.mark.parametrize('table', ['students', 'fees'])
+@pytest.mark.parametrize('sort', [None, 'name'])
+def test_refresh_keeps_page_filters_and_sort(dashboard, table, sort):
+    set_filters(dashboard, table, fee_status='Pending')
+    tick()  # The filter bar's own trigger
+    if sort is not None:
+        dashboard.sort_grid(table, sort)
+        dashboard.sort_grid(table, sort)
+    dashboard.turn_page(table, 'next')
+    dashboard.turn_page(table, 'next')
+    dashboard._grid(table).scroll_y = 0.4
+    page = shown(dashboard, table)
+    assert page[2].startswith('Rows 15-21 of ')
+
+    refresh(dashboard)
+    assert shown(dashboard, table) == page
+    dashboard.turn_page(table, 'first')
+    assert shown(dashboard, table)[2].startswith('Rows 1-7 of ')
+
+
+@pytest.mark.parametrize('table', ['students', 'fees'])
+def test_refresh_keeps_search(dashboard, table):
+    search_input = dashboard.search_input if table == 'students' else dashboard.fee_search_input
+    search_input.text = 'amina'
+    settle(dashboard)
+    (dashboard.search_students if table == 'students' else dashboard.search_fee_records)(None)
+    settle(dashboard)
+    dashboard.turn_page(table, 'next')
+    page = shown(dashboard, table)
+    assert all('amina' in record['name'].lower() for record in dashboard._grid(table).data)
+
+    refresh(dashboard)
+    assert shown(dashboard, table) == page
+    assert len(dashboard._grid_pages[table]['search']) < dashboard.students.live_count
+
+
+def test_refresh_shows_changes_saved_elsewhere(dashboard):
+    dashboard.sort_grid('students', 'name')
+    dashboard.turn_page('students', 'next')
+    ids, scroll, pager = shown(dashboard, 'students')
+    # Another terminal moves a student on the page to another class
+    view = dashboard.students.find('id', ids[1])
+    student = {name: view[name] for name in dashboard.students.columns}
+    student['class'] = 'Grade 12C'
+    dashboard.database.update_student(student)
+
+    refresh(dashboard)
+    grid = dashboard._grid('students')
+    assert [record['id'] for record in grid.data] == ids
+    assert grid.data[1]['class'] == 'Grade 12C'
+    assert dashboard._grid_pages['students']['pager_label'].text == pager
@@ -0,0 +1,120 @@
+# The filter bar of the student and fee grids, checked against a scan of
+# every row.
+import pytest
+
+from admin_dashboard import fee_status
+from conftest import brute_order, shown_pages, tick
+
+FILTERS = [
+    {'class': 'Grade 9B'},
+    {'fee_status': 'Pending'},
+    {'fee_status': 'Paid'},
+    {'active': 'Disabled'},
+    {'balance': '1000'},
+    {'class': 'grade 10B', 'fee_status': 'Pending', 'active': 'Active'},
+    {'class': 'Grade 9A', 'active': 'Active', 'balance': '750'},
+    {'class': 'Grade 10A', 'fee_status': 'Paid', 'active': 'Disabled', 'balance': '0'},
+]
+
+
+def set_filters(dashboard, table, class_name='All classes', fee_status='All fees', active='All students',
+                balance=''):
+    inputs = dashboard._filter_inputs[table]
+    inputs['class'].text = class_name
+    inputs['fee_status'].text = fee_status
+    inputs['active'].text = active
+    inputs['balance'].text = balance
+    dashboard.filter_grid(table)
+
+
+def passing(dashboard, class_name=None, status=None, active=None, balance=None, positions=None):
+    store = dashboard.students
+    if positions is None:
+        positions = store.rows().positions
+    return [position for position in positions
+            if (class_name is None or store[position]['class'] == class_name)
+            and (status is None or fee_status(store[position]['fees_due']) == status)
+            and (active is None or store[position]['active'] == (active == 'Active'))
+            and (balance is None or store[position]['fees_due'] > float(balance))]
+
+
+@pytest.mark.parametrize('table', ['students', 'fees'])
+@pytest.mark.parametrize('filters', FILTERS)
+def test_filters_match_scan(dashboard, table, filters):
+    set_filters(dashboard, table, filters.get('class', 'All classes'), filters.get('fee_status', 'All fees'),
+                filters.get('active', 'All students'), filters.get('balance', ''))
+    expected = passing(dashboard, filters.get('class'), filters.get('fee_status'), filters.get('active'),
+                       filters.get('balance'))
+    assert shown_pages(dashboard, table) == expected
+    dashboard.sort_grid(table, 'name')
+    dashboard.sort_grid(table, 'name')
+    assert shown_pages(dashboard, table) == brute_order(dashboard, 'name', True, expected)
+
+
+def test_filters_combine_with_search(dashboard):
+    store = dashboard.students
+    matches = [position for position in store.rows().positions if store[position]['name'].startswith('a')]
+    dashboard.show_students(store.select(matches))
+    set_filters(dashboard, 'students', fee_status='Pending', active='Active')
+    expected = passing(dashboard, status='Pending', active='Active', positions=matches)
+    assert shown_pages(dashboard, 'students') == expected
+
+    dashboard.sort_grid('students', 'fees_paid')
+    assert shown_pages(dashboard, 'students') == brute_order(dashboard, 'fees_paid', positions=expected)
+    assert list(dashboard._grid_positions('students')) == brute_order(dashboard, 'fees_paid', positions=expected)
+
+    set_filters(dashboard, 'students')
+    assert shown_pages(dashboard, 'students') == brute_order(dashboard, 'fees_paid', positions=matches)
+
+
+def test_paging_across_filter_changes(dashboard):
+    dashboard.sort_grid('fees', 'fees_due')
+    for _ in range(3):
+        dashboard.turn_page('fees', 'next')
+    set_filters(dashboard, 'fees', class_name='Grade 9A')
+    expected = brute_order(dashboard, 'fees_due', positions=passing(dashboard, 'Grade 9A'))
+    # A new filter starts from its first page
+    assert [record.position for record in dashboard.fee_rv.data] == expected[:dashboard.PAGE_ROWS]
+    assert shown_pages(dashboard, 'fees') == expected
+
+    dashboard.turn_page('fees', 'last')
+    set_filters(dashboard, 'fees', class_name='Grade 9A', fee_status='Pending')
+    expected = brute_order(dashboard, 'fees_due', positions=passing(dashboard, 'Grade 9A', 'Pending'))
+    assert shown_pages(dashboard, 'fees') == expected
+
+
+@pytest.mark.parametrize('table', ['students', 'fees'])
+def test_toggled_row_leaves_status_filtered_grid(dashboard, table):
+    set_filters(dashboard, 'students', active='Active')
+    set_filters(dashboard, 'fees', active='Active')
+    grid = dashboard._grid(table)
+    student = grid.data[2]
+    dashboard.toggle_student_status(student)
+    tick()
+    for shown_in in ('students', 'fees'):
+        assert student.position not in shown_pages(dashboard, shown_in)
+        assert shown_pages(dashboard, shown_in) == passing(dashboard, active='Active')
+
+    dashboard.toggle_student_status(student)
+    tick()
+    for shown_in in ('students', 'fees'):
+        assert student.position in shown_pages(dashboard, shown_in)
+
+
+def test_grids_follow_edits_under_filters(dashboard):
+    set_filters(dashboard, 'fees', fee_status='Pending', balance='500')
+    dashboard.sort_grid('fees', 'class')
+    dashboard.turn_page('fees', 'next')
+    paid_off, moved = dashboard.fee_rv.data[0], dashboard.fee_rv.data[1]
+    paid_off['fees_paid'], paid_off['fees_due'] = 2000.0, 0.0
+    dashboard.move_student_to_class(moved, 'Grade 9A' if moved['class'] != 'Grade 9A' else 'Grade 9B')
+    dashboard.notify('fee_rows')
+    tick()
+    expected = brute_order(dashboard, 'class', positions=passing(dashboard, status='Pending', balance='500'))
+    assert paid_off.position not in expected
+    assert shown_pages(dashboard, 'fees') == expected
+
+
+def test_class_choices_follow_rollups(dashboard):
+    assert dashboard._filter_inputs['students']['class'].values == (
+        ['All classes'] + sorted(dashboard.class_rollups.classes))
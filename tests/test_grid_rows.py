@@ -0,0 +1,11 @@
+def test_amounts_show_whole_shillings(dashboard):
+    # Fees are stored as floats; the grids show them as the reports do
+    student_rows = dashboard.student_rv.children[0].children
+    fee_rows = dashboard.fee_rv.children[0].children
+    assert student_rows and fee_rows
+    for row in student_rows:
+        assert row.fees_label.text == f"KES {int(row.student['fees_paid']):,}"
+    for row in fee_rows:
+        student = row.student
+        assert row.amount_label.text == (f"KES {int(student['fees_paid']):,}/"
+                                         f"{int(student['fees_paid'] + student['fees_due']):,}")
@@ -0,0 +1,92 @@
+# Sorting and keyset paging of the student and fee grids, checked against
+# a full sort of the same rows.
+import pytest
+
+import admin_dashboard
+from admin_dashboard import SORT_COLUMNS
+from conftest import brute_order, shown_pages, tick
+
+SORTS = [(table, column) for table, columns in SORT_COLUMNS.items() for column in columns.values()]
+
+
+def sort(dashboard, table, column, descending):
+    dashboard.sort_grid(table, column)
+    if descending:
+        dashboard.sort_grid(table, column)
+    assert dashboard._grid_pages[table]['descending'] == descending
+
+
+def test_unsorted_grid_lists_rows_in_order_added(dashboard):
+    for table in SORT_COLUMNS:
+        assert shown_pages(dashboard, table) == brute_order(dashboard, None)
+
+
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('table, column', SORTS)
+def test_sorted_pages_match_full_sort(dashboard, table, column, descending):
+    sort(dashboard, table, column, descending)
+    expected = brute_order(dashboard, column, descending)
+    assert shown_pages(dashboard, table) == expected
+    # Exports take every page, in the same order
+    assert list(dashboard._grid_positions(table)) == expected
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+@pytest.mark.parametrize('descending', [False, True])
+def test_sorted_search_result(dashboard, monkeypatch, use_numpy, descending):
+    if not use_numpy:
+        monkeypatch.setattr(admin_dashboard, 'load_numpy', lambda: None)
+    store = dashboard.students
+    matches = [position for position in store.rows().positions if 'amina' in store[position]['name'].lower()
+               or store[position]['fees_paid'] > 1500]
+    dashboard.show_students(store.select(matches))
+    sort(dashboard, 'students', 'class', descending)
+    assert shown_pages(dashboard, 'students') == brute_order(dashboard, 'class', descending, matches)
+    sort(dashboard, 'students', 'fees_paid', descending)
+    assert shown_pages(dashboard, 'students') == brute_order(dashboard, 'fees_paid', descending, matches)
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_page_turns(dashboard, descending):
+    sort(dashboard, 'fees', 'name', descending)
+    expected = brute_order(dashboard, 'name', descending)
+    size = dashboard.PAGE_ROWS
+    grid = dashboard.fee_rv
+
+    def page():
+        return [record.position for record in grid.data]
+
+    dashboard.turn_page('fees', 'next')
+    dashboard.turn_page('fees', 'next')
+    assert page() == expected[2 * size:3 * size]
+    dashboard.turn_page('fees', 'prev')
+    assert page() == expected[size:2 * size]
+    dashboard.turn_page('fees', 'last')
+    assert page() == expected[-size:]
+    dashboard.turn_page('fees', 'next')  # Already on the last page
+    assert page() == expected[-size:]
+    dashboard.turn_page('fees', 'first')
+    dashboard.turn_page('fees', 'prev')  # Already on the first page
+    assert page() == expected[:size]
+
+
+def test_order_follows_edits(dashboard):
+    sort(dashboard, 'students', 'fees_paid', False)
+    dashboard.turn_page('students', 'next')
+    store = dashboard.students
+    moved = dashboard.student_rv.data[3]
+    moved['fees_paid'] = 0.0
+    store.append({'id': 99999, 'student_number': 'S9999', 'name': 'New Student',
+                  'class': 'Grade 9A', 'fees_paid': 125.0, 'fees_due': 1875.0})
+    store.remove(dashboard.student_rv.data[0].position)
+    dashboard.notify('student_rows')
+    tick()
+    assert shown_pages(dashboard, 'students') == brute_order(dashboard, 'fees_paid')
+
+
+def test_bulk_extend_rebuilds_order(dashboard):
+    sort(dashboard, 'students', 'name', True)
+    dashboard.students.extend({'id': 100000 + number, 'student_number': f"X{number}", 'name': f"zed {number}",
+                               'class': 'Grade 9B', 'fees_paid': 0.0, 'fees_due': 2000.0} for number in range(20))
+    dashboard.show_students(dashboard.students.rows())
+    assert shown_pages(dashboard, 'students') == brute_order(dashboard, 'name', True)
@@ -0,0 +1,89 @@
+# Timing histograms for the dashboard's hot paths.
+# Every operation keeps a fixed set of buckets whose bounds grow
+# geometrically, so recording is O(1), memory never grows with use and
+# p50/p95 stay within one bucket width (about 19%) of the true value.
+# The dashboard records from the UI thread only, so recording takes no lock.
+
+import bisect
+import csv
+import time
+from contextlib import contextmanager
+
+# Bucket upper bounds in seconds: 0.1 ms doubling every 4 buckets, to ~100 s
+BUCKET_BOUNDS = tuple(0.0001 * 2 ** (step / 4) for step in range(81))
+EXPORT_FIELDS = ['operation', 'count', 'p50_ms', 'p95_ms', 'max_ms', 'total_ms']
+
+
+class TimingHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)  # The last bucket takes anything slower
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent):
+        # Upper bound of the bucket holding the percentile, capped at the
+        # slowest sample so a single sample reports its own time
+        if not self.count:
+            return 0.0
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for bucket, samples in enumerate(self.buckets):
+            seen += samples
+            if seen >= rank:
+                return min(BUCKET_BOUNDS[bucket] if bucket < len(BUCKET_BOUNDS) else self.max, self.max)
+        return self.max
+
+    def summary(self):
+        return {'count': self.count,
+                'p50_ms': self.percentile(50) * 1000,
+                'p95_ms': self.percentile(95) * 1000,
+                'max_ms': self.max * 1000,
+                'total_ms': self.total * 1000}
+
+
+class Timings:
+    def __init__(self):
+        self.histograms = {}
+
+    def record(self, operation, seconds):
+        histogram = self.histograms.get(operation)
+        if histogram is None:
+            histogram = self.histograms[operation] = TimingHistogram()
+        histogram.record(seconds)
+
+    @contextmanager
+    def time(self, operation):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(operation, time.perf_counter() - started)
+
+    def summaries(self):
+        return [dict(operation=operation, **histogram.summary())
+                for operation, histogram in sorted(self.histograms.items())]
+
+    def format_table(self):
+        if not self.histograms:
+            return "No timings recorded yet"
+        width = max(len('Operation'), *(len(operation) for operation in self.histograms))
+        lines = [f"{'Operation':<{width}} {'Count':>7} {'p50 ms':>9} {'p95 ms':>9} {'Max ms':>9}"]
+        for row in self.summaries():
+            lines.append(f"{row['operation']:<{width}} {row['count']:>7,} {row['p50_ms']:>9.1f} "
+                         f"{row['p95_ms']:>9.1f} {row['max_ms']:>9.1f}")
+        return "\n".join(lines)
+
+    def export_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            for row in self.summaries():
+                writer.writerow({key: round(value, 3) if isinstance(value, float) else value
+                                 for key, value in row.items()})